@@ -1,16 +1,54 @@
+import atexit
+import multiprocessing
 import os
 import re
+import gzip
+import hashlib
 import json
 import time
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
+from html import escape
+from itertools import chain
+from operator import attrgetter
 from typing import Dict, Any, List, Tuple, Optional
-from flask import Flask, request, jsonify, Response
+import numpy as np
+from flask import Flask, request, Response, send_from_directory
+from werkzeug.http import http_date
 
-app = Flask(__name__)
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; severity falls back to SEVERITY_RE
+    hyperscan = None
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # asgiref is optional; only needed to serve under an ASGI server
+    WsgiToAsgi = None
+
+app = Flask(__name__, static_folder=None)  # /static is served below, with immutable caching
 
 # ---------- Config ----------
 DEFAULT_PORT = int(os.getenv("PORT", "8123"))
 AUTO_REFRESH_SECONDS = 10  # client pull interval for "real-time"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Front-end assets are served from STATIC_DIR when present there, from the CDNs otherwise.
+# The names carry the version, so the files can be cached as immutable:
+#   curl -L -o static/chart-4.4.1.umd.min.js https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js
+#   npx tailwindcss@3.4 --content app.py --minify -o static/tailwind-3.4.min.css
+CHART_JS_FILE = "chart-4.4.1.umd.min.js"
+TAILWIND_CSS_FILE = "tailwind-3.4.min.css"
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PARALLEL_PARSE_MIN_BLOCKS = 256  # below this many exceptions a process pool costs more than it saves
 SEVERITY_PALETTE = {
     "Critical": "#DC2626",  # red-600
     "High": "#F59E0B",      # amber-500
@@ -19,51 +57,234 @@ SEVERITY_PALETTE = {
 }
 
 # ---------- Parsing Utilities ----------
-EXCEPTION_BLOCK_RE = re.compile(
-    r"^###\s*Exception\s*(\d+):\s*(?P<type>[^\n]+?)\s*?\n+"
-    r"(?:\*\*Message\*\*:\s*(?P<message>.*?)\n)?"
-    r"(?:\*\*Timestamp\*\*:\s*(?P<timestamp>.*?)\n)?"
-    r"(?:\*\*Location\*\*:\s*(?P<location>.*?)\n)?"
-    r"(?:\*\*Stack Trace\*\*.*?```(?P<stack>.*?)```)?",
-    re.DOTALL | re.MULTILINE,
-)
+# Reports are scanned as raw bytes, so all patterns are bytes patterns and only
+# the captured fields get decoded. Line ends may be \r\n, which strip() removes afterwards.
+# Exception blocks are found by their header; each field is then read with a small
+# line-anchored regex bounded to its block, instead of one DOTALL regex over the report
+EXCEPTION_HEADER_RE = re.compile(rb"^###\s*Exception\s*(\d+):[ \t]*(?P<type>.+)$", re.MULTILINE)
+EXCEPTION_FIELD_RES = {
+    "message": re.compile(rb"^\*\*Message\*\*:[ \t]*(.*)$", re.MULTILINE),
+    "timestamp": re.compile(rb"^\*\*Timestamp\*\*:[ \t]*(.*)$", re.MULTILINE),
+    "location": re.compile(rb"^\*\*Location\*\*:[ \t]*(.*)$", re.MULTILINE),
+}
+# Bound search methods, looked up once for the per-block loop
+_FIELD_SEARCHES = tuple((name, field_re.search) for name, field_re in EXCEPTION_FIELD_RES.items())
 
+FIX_RE = re.compile(rb"^###\s*Fix\s*\d+:", re.MULTILINE)
+
+# The summary heading, then its three consecutive bullet lines searched from there on. No
+# DOTALL and every .*? stays within one line, so the search is linear in the report size
+SUMMARY_HEADER_RE = re.compile(rb"##\s*Summary", re.IGNORECASE)
 SUMMARY_RE = re.compile(
-    r"##\s*Summary.*?"
-    r"\-\s*\*\*Log File\*\*:\s*(?P<log>.*?)\n"
-    r"\-\s*\*\*Total Exceptions Found\*\*:\s*(?P<total>\d+)\n"
-    r"\-\s*\*\*Code Fixes Generated\*\*:\s*(?P<fixes>\d+)",
-    re.DOTALL | re.IGNORECASE,
+    rb"^-[ \t]*\*\*Log File\*\*:[ \t]*(?P<log>.*?)\r?\n"
+    rb"-[ \t]*\*\*Total Exceptions Found\*\*:[ \t]*(?P<total>\d+)\r?\n"
+    rb"-[ \t]*\*\*Code Fixes Generated\*\*:[ \t]*(?P<fixes>\d+)",
+    re.MULTILINE | re.IGNORECASE,
 )
 
-def infer_severity(exc_type: str, message: str) -> str:
-    t = exc_type.lower()
-    m = (message or "").lower()
-    # Heuristics (tweak as you like):
-    if "dataaccessresourcefailure" in t or "sql" in t and ("connection refused" in m or "timeout" in m):
-        return "Critical"
-    if "ioexception" in t and ("no space" in m or "disk" in m):
+SEVERITIES = ("Critical", "High", "Medium", "Low")
+SEVERITY_INDEX = {k: i for i, k in enumerate(SEVERITIES)}  # heatmap row of each severity
+
+# Severity heuristics (tweak as you like) as one regex over "<type>\n<message>", lowercased.
+# Every branch is tried at the start of the string in order, so the first branch that
+# matches wins like the if-chain it replaces; the group name is the severity.
+SEVERITY_RE = re.compile(
+    r"(?P<Critical>[^\n]*dataaccessresourcefailure"
+    r"|[^\n]*sql[^\n]*\n.*(?:connection refused|timeout)"
+    r"|[^\n]*ioexception[^\n]*\n.*(?:no space|disk))"
+    r"|(?P<High>[^\n]*nullpointer)"
+    r"|(?P<Medium>[^\n]*illegalargument)",
+    re.DOTALL,
+)
+
+_severity_match = SEVERITY_RE.match
+
+# Keywords of the same heuristics for the hyperscan path: one caseless scan of "<type>\n<message>"
+# reports which keywords occur in the type and which in the message
+SEVERITY_KEYWORDS = (
+    "dataaccessresourcefailure", "sql", "ioexception", "nullpointer", "illegalargument",
+    "connection refused", "timeout", "no space", "disk",
+)
+
+def _compile_severity_database() -> Optional[Any]:
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(k).encode() for k in SEVERITY_KEYWORDS],
+        ids=list(range(len(SEVERITY_KEYWORDS))),
+        elements=len(SEVERITY_KEYWORDS),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(SEVERITY_KEYWORDS),
+    )
+    return database
+
+SEVERITY_DATABASE = _compile_severity_database()
+_severity_scratch = threading.local()  # a scratch may only be used by one scan at a time
+
+def _severity_from_hits(in_type: set, in_message: set) -> str:
+    if ("dataaccessresourcefailure" in in_type
+            or ("sql" in in_type and ("connection refused" in in_message or "timeout" in in_message))
+            or ("ioexception" in in_type and ("no space" in in_message or "disk" in in_message))):
         return "Critical"
-    if "nullpointer" in t:
+    if "nullpointer" in in_type:
         return "High"
-    if "illegalargument" in t:
+    if "illegalargument" in in_type:
         return "Medium"
-    # default
     return "Low"
 
+def _hyperscan_severity(exc_type: str, message: str) -> str:
+    scratch = getattr(_severity_scratch, "scratch", None)
+    if scratch is None:
+        scratch = _severity_scratch.scratch = hyperscan.Scratch(SEVERITY_DATABASE)
+    type_end = len(exc_type.encode("utf-8"))
+    in_type, in_message = set(), set()
+
+    def on_match(keyword_id, start, end, flags, context):
+        # keywords have no newline, so the end offset tells which side of it the hit is on
+        (in_type if end <= type_end else in_message).add(SEVERITY_KEYWORDS[keyword_id])
+
+    SEVERITY_DATABASE.scan(f"{exc_type}\n{message or ''}".encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+    return _severity_from_hits(in_type, in_message)
+
+def infer_severity(exc_type: str, message: str) -> str:
+    if SEVERITY_DATABASE is not None:
+        return _hyperscan_severity(exc_type, message)
+    m = _severity_match(f"{exc_type.lower()}\n{(message or '').lower()}")
+    return m.lastgroup if m else "Low"
+
+@dataclass(slots=True)
+class ParsedException:
+    # One "### Exception N:" block; orjson serializes it as a dict with these keys in this order
+    index: int
+    type: str
+    message: str
+    timestamp: Optional[float]
+    timestamp_raw: str
+    location: str
+    stack: str
+    severity: str
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", "replace")
+
+def _exception_block_spans(data) -> List[Tuple[int, int]]:
+    # (start, end) byte offsets of every "### Exception N:" block, header included
+    if data.find(b"### Exception") == -1:  # cheap prefilter: most of a report is fix text
+        return []
+    starts = [h.start() for h in EXCEPTION_HEADER_RE.finditer(data)]
+    spans = []
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(data)
+        section = data.find(b"\n## ", start, end)  # the last block ends at the next "##" section
+        spans.append((start, section if section != -1 else end))
+    return spans
+
+def _parse_block_range(data, spans: List[Tuple[int, int]]) -> List[ParsedException]:
+    # Parses the given blocks of the report bytes; fields are decoded to str
+    exceptions = []
+    for block_start, end in spans:
+        h = EXCEPTION_HEADER_RE.match(data, block_start)
+        if h is None:  # span does not start at a header (e.g. computed on other bytes); skip the block
+            continue
+        start = h.end()
+        fields = {}
+        for name, search in _FIELD_SEARCHES:
+            m = search(data, start, end)
+            fields[name] = _decode(m.group(1)).strip() if m else ""
+        stack = ""
+        marker = data.find(b"**Stack Trace**", start, end)
+        if marker != -1:
+            open_fence = data.find(b"```", marker, end)
+            close_fence = data.find(b"```", open_fence + 3, end) if open_fence != -1 else -1
+            if close_fence != -1:
+                stack = _decode(data[open_fence + 3:close_fence]).replace("\r\n", "\n").strip()
+        etype = _decode(h.group("type")).strip()
+        msg = fields["message"]
+        ts_raw = fields["timestamp"]
+        exceptions.append(ParsedException(
+            int(h.group(1)), etype, msg, parse_timestamp(ts_raw), ts_raw,
+            fields["location"], stack, infer_severity(etype, msg),
+        ))
+    return exceptions
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_workers = 1
+_parse_pool_lock = threading.Lock()
+
+def start_parse_pool(workers: Optional[int] = None) -> None:
+    # Process pool for large reports, started by the first one of them whichever server runs the app
+    # (the debug reloader's watcher never serves requests, so it never starts one); it is shut down
+    # at exit. Workers are spawned rather than forked from the threaded server. With one CPU there
+    # is no pool and every report is parsed serially
+    global _parse_pool, _parse_workers
+    workers = workers or os.cpu_count() or 1
+    with _parse_pool_lock:
+        # Concurrent first requests must not each start a pool
+        if _parse_pool is not None or workers < 2:
+            return
+        _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _parse_workers = workers
+        atexit.register(_parse_pool.shutdown, cancel_futures=True)
+
+def _parse_blocks_parallel(data, spans: List[Tuple[int, int]]) -> List[ParsedException]:
+    # re holds the GIL, so the split goes to processes rather than threads. Each worker gets a copy
+    # of the bytes of its blocks, not the path: the orchestrator rewrites reports in place, so a
+    # worker opening the file itself could see other offsets than the spans were computed on
+    step = -(-len(spans) // _parse_workers)
+    futures = []
+    for i in range(0, len(spans), step):
+        chunk = spans[i:i + step]
+        base = chunk[0][0]
+        futures.append(_parse_pool.submit(
+            _parse_block_range, data[base:chunk[-1][1]], [(start - base, end - base) for start, end in chunk]
+        ))
+    return list(chain.from_iterable(f.result() for f in futures))
+
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S,%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%d-%m-%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+def _fast_parse_ts(s: str) -> Optional[float]:
+    # Zero-padded forms of TIMESTAMP_FORMATS, sliced by position instead of probing strptime;
+    # returns None for anything else so the caller can fall back to strptime
+    n = len(s)
+    if n < 19 or s[13] != ":" or s[16] != ":":
+        return None
+    frac = ""
+    if s[4] == "-" and s[7] == "-" and s[10] in " T":
+        y, mo, d = s[0:4], s[5:7], s[8:10]
+        if n > 19:
+            # Only the space-separated form has a ",%f" fraction (1-6 digits)
+            if s[10] != " " or s[19] != "," or not 21 <= n <= 26:
+                return None
+            frac = s[20:]
+    elif s[2] == s[5] and s[2] in "-/" and s[10] == " " and n == 19:
+        d, mo, y = s[0:2], s[3:5], s[6:10]
+    else:
+        return None
+    h, mi, se = s[11:13], s[14:16], s[17:19]
+    if not (y + mo + d + h + mi + se + frac).isdigit():
+        return None
+    try:
+        return datetime(int(y), int(mo), int(d), int(h), int(mi), int(se),
+                        int(frac.ljust(6, "0")) if frac else 0).timestamp()
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)  # timestamps repeat a lot between the exceptions of one report
 def parse_timestamp(raw: Optional[str]) -> Optional[float]:
     if not raw:
         return None
     raw = raw.strip()
-    # Try some common formats
-    fmts = [
-        "%Y-%m-%d %H:%M:%S,%f",
-        "%Y-%m-%d %H:%M:%S",
-        "%d-%m-%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S",
-    ]
-    for f in fmts:
+    ts = _fast_parse_ts(raw)
+    if ts is not None:
+        return ts
+    # Non-padded or otherwise unusual values: try the formats one by one
+    for f in TIMESTAMP_FORMATS:
         try:
             return datetime.strptime(raw, f).timestamp()
         except Exception:
@@ -74,69 +295,66 @@ def parse_report(path: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"File not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        text = f.read()
+    # Read as bytes, not mmap'd: the orchestrator rewrites reports in place, and touching a mapped
+    # page past the new end of a truncated file raises SIGBUS, which kills the whole worker.
+    # Reports are small, and only the captured fields get decoded
+    with open(path, "rb") as f:
+        data = f.read()
+    return _parse_report_data(path, data)
 
+def _parse_report_data(path: str, data) -> Dict[str, Any]:
     # Summary
     total_excs_declared = None
     fixes_declared = None
-    m = SUMMARY_RE.search(text)
+    header = SUMMARY_HEADER_RE.search(data)
+    m = SUMMARY_RE.search(data, header.end()) if header else None
     log_file, total, fixes = None, None, None
     if m:
-        log_file = m.group("log").strip()
+        log_file = _decode(m.group("log")).strip()
         total = int(m.group("total"))
         fixes = int(m.group("fixes"))
         total_excs_declared = total
         fixes_declared = fixes
 
     # Exceptions
-    exceptions: List[Dict[str, Any]] = []
-    for m in EXCEPTION_BLOCK_RE.finditer(text):
-        idx = int(m.group(1))
-        etype = m.group("type").strip()
-        msg = (m.group("message") or "").strip()
-        ts_raw = (m.group("timestamp") or "").strip()
-        loc = (m.group("location") or "").strip()
-        stack = (m.group("stack") or "").strip()
-        ts = parse_timestamp(ts_raw)
-
-        severity = infer_severity(etype, msg)
-        exceptions.append({
-            "index": idx,
-            "type": etype,
-            "message": msg,
-            "timestamp": ts,
-            "timestamp_raw": ts_raw,
-            "location": loc,
-            "stack": stack,
-            "severity": severity,
-        })
-
-    # Sort by timestamp if available, else by index
-    exceptions.sort(key=lambda e: (e["timestamp"] is None, e["timestamp"] or e["index"]))
+    spans = _exception_block_spans(data)
+    parallel = len(spans) >= PARALLEL_PARSE_MIN_BLOCKS
+    if parallel and _parse_pool is None:
+        start_parse_pool()
+    if parallel and _parse_pool is not None:
+        exceptions = _parse_blocks_parallel(data, spans)
+    else:
+        exceptions = _parse_block_range(data, spans)
+
+    # Sort by timestamp if available, else by index (untimed exceptions go last)
+    timed = [e for e in exceptions if e.timestamp is not None]
+    if len(timed) != len(exceptions):
+        untimed = [e for e in exceptions if e.timestamp is None]
+        timed.sort(key=attrgetter("timestamp"))
+        untimed.sort(key=attrgetter("index"))
+        exceptions = timed + untimed
+    else:
+        exceptions.sort(key=attrgetter("timestamp"))
 
     # Metrics
     total_exceptions = len(exceptions)
-    fixes_count = fixes_declared if fixes_declared is not None else _infer_fix_count(text)
-    by_type: Dict[str, int] = {}
-    by_severity: Dict[str, int] = {"Critical": 0, "High": 0, "Medium": 0, "Low": 0}
-    for e in exceptions:
-        by_type[e["type"]] = by_type.get(e["type"], 0) + 1
-        by_severity[e["severity"]] = by_severity.get(e["severity"], 0) + 1
+    fixes_count = fixes_declared if fixes_declared is not None else _infer_fix_count(data)
+    by_type: Dict[str, int] = dict(Counter(e.type for e in exceptions))
+    severity_counts = Counter(e.severity for e in exceptions)
+    by_severity: Dict[str, int] = {k: severity_counts[k] for k in SEVERITIES}
 
     # Timeline: bucket by order (fallback) or timestamp minute
     timeline_labels: List[str] = []
     timeline_values: List[int] = []
-    if any(e["timestamp"] for e in exceptions):
-        # Group by minute
+    if any(e.timestamp for e in exceptions):
+        # Group by minute: count epoch minutes in numpy, then format only the distinct minutes
+        ts = np.fromiter((e.timestamp for e in exceptions if e.timestamp is not None), dtype=np.float64)
+        minutes, counts = np.unique((ts // 60).astype(np.int64), return_counts=True)
         buckets: Dict[str, int] = {}
-        for e in exceptions:
-            t = e["timestamp"]
-            if t is None:
-                continue
-            dt = datetime.fromtimestamp(t)
-            key = dt.strftime("%Y-%m-%d %H:%M")
-            buckets[key] = buckets.get(key, 0) + 1
+        for minute, count in zip(minutes.tolist(), counts.tolist()):
+            key = datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d %H:%M")
+            # Summed, not assigned: a local minute repeats when the clock goes back (DST)
+            buckets[key] = buckets.get(key, 0) + count
         for k in sorted(buckets.keys()):
             timeline_labels.append(k)
             timeline_values.append(buckets[k])
@@ -148,12 +366,19 @@ def parse_report(path: str) -> Dict[str, Any]:
 
     # Heatmap (service health): rows = severity, cols = timeline buckets (compress to 10)
     heat_cols = min(10, max(1, len(timeline_labels)))
-    # map exceptions into segments
-    segment = lambda i: min(heat_cols - 1, int((i / max(1, len(exceptions))) * heat_cols))
-    heatmap: Dict[str, List[int]] = {k: [0]*heat_cols for k in ["Critical","High","Medium","Low"]}
-    for i, e in enumerate(exceptions):
-        c = segment(i)
-        heatmap[e["severity"]][c] += 1
+    # map exceptions into segments by position, then scatter-add all (row, col) pairs at once
+    n = len(exceptions)
+    sev_ids = np.fromiter((SEVERITY_INDEX[e.severity] for e in exceptions), dtype=np.intp, count=n)
+    col_ids = np.minimum(heat_cols - 1, np.arange(n) * heat_cols // max(1, n))
+    counts = np.zeros((len(SEVERITIES), heat_cols), dtype=np.int64)
+    np.add.at(counts, (sev_ids, col_ids), 1)
+    # rows stay numpy arrays; _dumps serializes them without a tolist() copy
+    heatmap: Dict[str, np.ndarray] = dict(zip(SEVERITIES, counts))
+
+    # The list is rendered here once per parse, so the client does one innerHTML assignment per
+    # change instead of building N nodes every poll; the hash lets it skip unchanged lists
+    exceptions_html = "".join(_exception_html(e) for e in exceptions)
+    exceptions_hash = hashlib.blake2b(exceptions_html.encode("utf-8"), digest_size=16).hexdigest()
 
     return {
         "source_file": path,
@@ -165,38 +390,110 @@ def parse_report(path: str) -> Dict[str, Any]:
         "timeline": {"labels": timeline_labels, "values": timeline_values},
         "heatmap": {"cols": heat_cols, "data": heatmap},
         "exceptions": exceptions,
+        "exceptions_html": exceptions_html,
+        "exceptions_hash": exceptions_hash,
         "ref_declared_total": total_excs_declared,
         "generated_at": int(time.time()),
     }
 
-def _infer_fix_count(text: str) -> int:
-    # Try to read "## Code Fix Recommendations" and count "### Fix"
-    fix_matches = re.findall(r"^###\s*Fix\s*\d+:", text, re.MULTILINE)
-    return len(fix_matches) if fix_matches else 0
+def _exception_html(e: ParsedException) -> str:
+    # One collapsible entry of the exceptions list; every report value is escaped
+    color = SEVERITY_PALETTE.get(e.severity, "#64748B")
+    stack = f'<pre class="bg-slate-50 rounded p-2 overflow-x-auto text-[11px]">{escape(e.stack)}</pre>' if e.stack else ""
+    return (
+        '<details class="rounded-xl border p-3">'
+        '<summary class="cursor-pointer flex flex-wrap items-center gap-2">'
+        f'<span class="font-semibold">{escape(e.type)}</span>'
+        f'<span class="text-xs px-2 py-0.5 rounded-full" style="background:{color}20;color:{color};border:1px solid {color}40">{e.severity}</span>'
+        f'<span class="text-slate-500 text-sm">#{e.index}</span>'
+        f'<span class="text-slate-400 text-xs ml-auto">{escape(e.timestamp_raw) or "No timestamp"}</span>'
+        '</summary>'
+        '<div class="mt-2 grid gap-2 text-sm">'
+        f'<div><span class="text-slate-500">Message:</span> {escape(e.message) or "—"}</div>'
+        f'<div><span class="text-slate-500">Location:</span> {escape(e.location) or "—"}</div>'
+        f'{stack}</div></details>'
+    )
+
+def _infer_fix_count(data) -> int:
+    # Try to read "## Code Fix Recommendations" and count "### Fix" without building a match list
+    return sum(1 for _ in FIX_RE.finditer(data))
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, ParsedException):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+def _json_response(data: Dict[str, Any], status: int = 200) -> Response:
+    return Response(_dumps(data), status=status, mimetype="application/json")
+
+@lru_cache(maxsize=32)
+def _parse_cached(path: str, mtime_ns: int, size: int) -> Tuple[bytes, bytes]:
+    # mtime_ns and size only key the cache: a rewritten report misses it and is parsed again.
+    # The body is gzipped here as well, once per report version rather than once per poll
+    body = _dumps(parse_report(path))
+    return body, gzip.compress(body, 6)
 
 # ---------- API ----------
 @app.get("/api/data")
 def api_data() -> Response:
     path = request.args.get("file", "").strip()
     if not path:
-        return jsonify({"error": "Missing 'file' query param"}), 400
+        return _json_response({"error": "Missing 'file' query param"}, 400)
     try:
-        data = parse_report(path)
-        return jsonify(data)
+        # Polls of an unchanged report cost one stat(): no read, no parse, no encode
+        st = os.stat(path)
+        etag = f"{st.st_mtime_ns}-{st.st_size}"
+        headers = {
+            "ETag": f'W/"{etag}"',
+            "Last-Modified": http_date(st.st_mtime),
+            "Vary": "Accept-Encoding",
+        }
+        if "If-None-Match" in request.headers:
+            # The ETag is finer grained than Last-Modified's whole seconds, so it takes precedence.
+            # Weak comparison, as RFC 9110 asks for If-None-Match: lists, "*" and W/ all match
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=headers)
+        elif request.if_modified_since is not None and int(st.st_mtime) <= request.if_modified_since.timestamp():
+            return Response(status=304, headers=headers)
+        body, body_gz = _parse_cached(path, st.st_mtime_ns, st.st_size)
+        if request.accept_encodings["gzip"]:
+            return Response(body_gz, mimetype="application/json", headers={**headers, "Content-Encoding": "gzip"})
+        return Response(body, mimetype="application/json", headers=headers)
     except FileNotFoundError as e:
-        return jsonify({"error": str(e)}), 404
+        return _json_response({"error": str(e)}, 404)
     except Exception as e:
-        return jsonify({"error": f"Failed to parse: {e}"}), 500
+        return _json_response({"error": f"Failed to parse: {e}"}, 500)
 
 # ---------- UI ----------
+def _asset_tags() -> str:
+    if os.path.isfile(os.path.join(STATIC_DIR, CHART_JS_FILE)):
+        chart = f'<script src="/static/{CHART_JS_FILE}"></script>'
+    else:
+        chart = '<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.1"></script>'
+    if os.path.isfile(os.path.join(STATIC_DIR, TAILWIND_CSS_FILE)):
+        tailwind = f'<link rel="stylesheet" href="/static/{TAILWIND_CSS_FILE}" />'
+    else:
+        tailwind = '<script src="https://cdn.tailwindcss.com"></script>'
+    return f"{chart}\n{tailwind}"
+
+def _minify_html(html: str) -> str:
+    # Drops indentation and blank lines only: line breaks stay, so inline JS keeps its semicolon insertion
+    return "\n".join(stripped for stripped in (line.strip() for line in html.splitlines()) if stripped)
+
 INDEX_HTML = f"""<!doctype html>
 <html lang="en" class="h-full">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
   <title>Log Exceptions Dashboard</title>
-  <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.1"></script>
-  <script src="https://cdn.tailwindcss.com"></script>
+  {_asset_tags()}
   <style>
     /* Focus styles for accessibility */
     :focus {{ outline: 3px solid #3B82F6; outline-offset: 2px; }}
@@ -283,6 +580,7 @@ const SEVERITY_COLORS = {{
 
 let charts = {{ typesBar: null, severityPie: null, timelineLine: null, heatmap: null }};
 let currentFile = null;
+let lastExceptionsHash = null;
 
 function getParam(name) {{
   return new URLSearchParams(window.location.search).get(name);
@@ -416,31 +714,11 @@ function render(data) {{
     }}
   }});
 
-  // Details list (progressive disclosure)
-  const list = document.getElementById('exceptionList');
-  list.innerHTML = '';
-  (data.exceptions || []).forEach(e => {{
-    const wrapper = document.createElement('details');
-    wrapper.className = 'rounded-xl border p-3';
-    const sevColor = SEVERITY_COLORS[e.severity] || '#64748B';
-wrapper.innerHTML = `
-  <summary class="cursor-pointer flex flex-wrap items-center gap-2">
-    <span class="font-semibold">${{e.type}}</span>
-    <span class="text-xs px-2 py-0.5 rounded-full"
-          style="background:${{sevColor}}20;color:${{sevColor}};border:1px solid ${{sevColor}}40">
-      ${{e.severity}}
-    </span>
-    <span class="text-slate-500 text-sm">#${{e.index}}</span>
-    <span class="text-slate-400 text-xs ml-auto">${{e.timestamp_raw || 'No timestamp'}}</span>
-  </summary>
-  <div class="mt-2 grid gap-2 text-sm">
-    <div><span class="text-slate-500">Message:</span> ${{e.message || '—'}}</div>
-    <div><span class="text-slate-500">Location:</span> ${{e.location || '—'}}</div>
-    ${{safeStack ? `<pre class="bg-slate-50 rounded p-2 overflow-x-auto text-[11px]">${{safeStack}}</pre>` : ''}}
-  </div>
-`;
-    list.appendChild(wrapper);
-  }});
+  // Details list (progressive disclosure), rendered server-side; left alone when unchanged
+  if (data.exceptions_hash !== lastExceptionsHash) {{
+    document.getElementById('exceptionList').innerHTML = data.exceptions_html || '';
+    lastExceptionsHash = data.exceptions_hash;
+  }}
 }}
 
 async function fetchAndRender() {{
@@ -467,10 +745,30 @@ window.addEventListener('DOMContentLoaded', init);
 </html>
 """
 
+# The page never changes at runtime: encode and gzip it once at import
+INDEX_BYTES = _minify_html(INDEX_HTML).encode("utf-8")
+INDEX_GZ = gzip.compress(INDEX_BYTES, 9)
+INDEX_CACHE_CONTROL = "public, max-age=300"  # the page itself is not refetched on every poll
+
 @app.get("/")
 def index():
-    return Response(INDEX_HTML, mimetype="text/html")
+    headers = {"Cache-Control": INDEX_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if request.accept_encodings["gzip"]:
+        headers["Content-Encoding"] = "gzip"
+        return Response(INDEX_GZ, mimetype="text/html", headers=headers)
+    return Response(INDEX_BYTES, mimetype="text/html", headers=headers)
+
+@app.get("/static/<path:filename>")
+def static_file(filename: str):
+    response = send_from_directory(STATIC_DIR, filename)
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return response
 
 # ---------- Entry ----------
+# For many open tabs run under an ASGI server, e.g. `uvicorn app:asgi_app --workers 4`;
+# each request then runs in the server's thread pool
+asgi_app = WsgiToAsgi(app) if WsgiToAsgi is not None else None
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=DEFAULT_PORT, debug=True)
+    # threaded: one slow parse does not block the polls of other tabs
+    app.run(host="0.0.0.0", port=DEFAULT_PORT, debug=os.getenv("FLASK_DEBUG", "1") != "0", threaded=True)
@@ -5,18 +5,56 @@ This agent analyzes exception information and generates Java code fixes using LL
 It understands Spring Boot context and provides meaningful code suggestions.
 """
 
+from __future__ import annotations
+
+import asyncio
+import hashlib
 import json
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
+from dataclasses import dataclass, replace
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from log_analysis_agent import ExceptionInfo
+from llm_cache import LLMCache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library parser
+    orjson = None
+
+
+# Model used for fixes unless the caller passes another one
+DEFAULT_MODEL = "gemini-2.5-flash"
+# Cheaper, faster model for logs with only a few exceptions to fix
+SMALL_LOG_MODEL = "gemini-2.5-flash-lite"
+
+# Target size of a code fixing prompt; stack frames and context lines are trimmed to fit
+MAX_PROMPT_TOKENS = 2000
+
+
+# Gemini Batch API job states after which the job no longer changes
+BATCH_JOB_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+})
+
 
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token for English and code)"""
+    return len(text) // 4 + 1
 
-@dataclass
+
+def parse_json(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@dataclass(slots=True)
 class CodeFix:
     """Data class to hold code fix information"""
     exception_type: str
@@ -26,14 +64,32 @@ class CodeFix:
     code_suggestions: List[Dict[str, str]]  # [{"file": "...", "method": "...", "code": "..."}]
     prevention_tips: List[str]
     confidence_score: float  # 0.0 to 1.0
+    duplicate_count: int = 1  # Occurrences of the exception this fix applies to
 
 
 class CodeFixingAgent:
     """Agent responsible for analyzing exceptions and generating Java code fixes"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, cache: Optional[LLMCache] = None, batch_size: int = 8):
+        # LLM clients by model name, so every call with a model reuses that client's connection pool
+        self._llms: Dict[str, Any] = {}
+        self._llms_lock = threading.Lock()
         #self.llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.1)
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1)
+        self.llm = self.llm_for(DEFAULT_MODEL)
+        
+        # Upper bound on concurrent LLM calls when analyzing several exceptions
+        self.max_workers = max_workers
+        
+        # Exceptions packed into one prompt by analyze_batch
+        self.batch_size = batch_size
+        
+        # Parsed fix data for exceptions that were already analyzed
+        self.cache = cache if cache is not None else LLMCache()
+        
+        # JSON object embedded in an LLM response
+        self.json_block_pattern = re.compile(r'\{.*\}', re.DOTALL)
+        # JSON list embedded in a batch LLM response
+        self.json_list_pattern = re.compile(r'\[.*\]', re.DOTALL)
         
         # System prompt for code fixing
         self.system_prompt = """You are an expert Java and Spring Boot developer with extensive experience in debugging and fixing application issues. Your task is to analyze exception information from Spring Boot applications and provide practical, actionable code fixes.
@@ -54,13 +110,11 @@ Provide fixes that are:
 
 Format your response as a structured analysis with clear code examples."""
 
-        # Create the prompt template
-        self.prompt_template = ChatPromptTemplate.from_messages([
-            ("system", self.system_prompt),
-            ("human", """Analyze the following exception from a Spring Boot application and provide a comprehensive fix:
-
-Exception Details:
-- Type: {exception_type}
+        # Built once and shared by every prompt
+        self.system_message = SystemMessage(content=self.system_prompt)
+        
+        # Details of one exception, shared by the single and the batch prompt
+        self.exception_template = """- Type: {exception_type}
 - Message: {exception_message}
 - Timestamp: {timestamp}
 - Log Level: {log_level}
@@ -73,7 +127,11 @@ Stack Trace:
 {stack_trace}
 
 Surrounding Context:
-{surrounding_context}
+{surrounding_context}"""
+        
+        # Human prompt template, filled with str.format. Static instructions come first and the
+        # exception last, so providers that cache prompt prefixes can reuse everything before it.
+        self.human_template = """Analyze the exception from a Spring Boot application given at the end of this message and provide a comprehensive fix.
 
 Please provide:
 1. Root cause analysis
@@ -100,43 +158,159 @@ Format your response as JSON with the following structure:
         "Tip 2 for preventing similar issues"
     ],
     "confidence_score": 0.85
-}}"""
-)
-        ])
+}}
+
+Exception Details:
+""" + self.exception_template
+        
+        # Batch variant of the human prompt: the system prompt and instructions are sent once for
+        # several exceptions, each rendered with exception_template under a numbered delimiter
+        self.batch_template = """Analyze each of the {count} exceptions from a Spring Boot application given at the end of this message and provide a comprehensive fix for each of them.
+
+Please provide for every exception:
+1. Root cause analysis
+2. Specific code fixes with examples
+3. Prevention strategies
+4. Best practices recommendations
+
+Format your response as a JSON list with one object per exception, keyed by the exception number:
+[
+    {{
+        "index": 0,
+        "root_cause": "Detailed explanation of what caused this exception",
+        "fix_description": "High-level description of the fix approach",
+        "code_suggestions": [
+            {{
+                "file": "filename or class name",
+                "method": "method name where fix should be applied",
+                "description": "What this fix does",
+                "original_issue": "The problematic code pattern",
+                "fixed_code": "The corrected Java code",
+                "explanation": "Why this fix works"
+            }}
+        ],
+        "prevention_tips": [
+            "Tip 1 for preventing similar issues",
+            "Tip 2 for preventing similar issues"
+        ],
+        "confidence_score": 0.85
+    }}
+]
+
+{exceptions}"""
+        
+        # Tokens taken by the templates themselves, before any exception content is filled in
+        self.static_prompt_tokens = estimate_tokens(self.system_prompt) + estimate_tokens(self.human_template)
+        
+        # Part of every cache key: changing the prompts, the fix schema in them or the token budget
+        # changes the keys, so fixes cached for the old prompts are not served
+        self.prompt_version = hashlib.blake2b(
+            "\0".join((self.system_prompt, self.human_template, self.batch_template, str(MAX_PROMPT_TOKENS))).encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
     
-    def analyze_exception(self, exception_info: ExceptionInfo) -> CodeFix:
-        """Analyze a single exception and generate code fixes"""
+    def llm_for(self, model: Optional[str] = None) -> Any:
+        """LLM client of the given model (the default one for None), created on first use and reused after
         
-        # Prepare the input data
-        stack_trace_str = "\n".join(exception_info.stack_trace[:15])  # Limit to first 15 lines
-        context_str = "\n".join(exception_info.surrounding_context)
+        The model is picked per call rather than stored on the agent, so concurrent runs sharing
+        the agent cannot switch each other's model.
+        """
+        if model is None:
+            return self.llm
+        client = self._llms.get(model)
+        if client is None:
+            with self._llms_lock:
+                client = self._llms.get(model)
+                if client is None:
+                    # Imported here so importing this module (e.g. for log parsing only) stays fast
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+                    client = self._llms[model] = ChatGoogleGenerativeAI(model=model, temperature=0.1)
+        return client
+    
+    def cache_key(self, exception_info: ExceptionInfo, model: Optional[str] = None) -> str:
+        """Cache key of the fix for an exception by the given model (the default one for None)"""
+        return self.cache.key_for(exception_info, model or DEFAULT_MODEL, self.prompt_version)
+    
+    def _build_prompt(self, exception_info: ExceptionInfo) -> List[Any]:
+        """Build the chat prompt for a single exception"""
+        return [self.system_message, HumanMessage(content=self.human_template.format(**self._prompt_fields(exception_info)))]
+    
+    def _build_batch_prompt(self, exceptions: List[ExceptionInfo]) -> List[Any]:
+        """Build one chat prompt covering several exceptions, numbered from 0"""
+        sections = [
+            f"=== Exception {i} ===\n" + self.exception_template.format(**self._prompt_fields(exception))
+            for i, exception in enumerate(exceptions)
+        ]
+        return [self.system_message, HumanMessage(content=self.batch_template.format(
+            count=len(exceptions),
+            exceptions="\n\n".join(sections)
+        ))]
+    
+    def _prompt_fields(self, exception_info: ExceptionInfo) -> Dict[str, Any]:
+        """Values for exception_template, with the stack trace and context trimmed to the prompt token budget"""
+        stack_trace, context = self._fit_to_budget(exception_info)
+        
+        return {
+            "exception_type": exception_info.exception_type,
+            "exception_message": exception_info.exception_message,
+            "timestamp": exception_info.timestamp,
+            "log_level": exception_info.log_level,
+            "file_path": exception_info.file_path or "Unknown",
+            "line_number": exception_info.line_number or "Unknown",
+            "method_name": exception_info.method_name or "Unknown",
+            "class_name": exception_info.class_name or "Unknown",
+            "stack_trace": "\n".join(stack_trace),  # Already capped at extraction time
+            "surrounding_context": "\n".join(context)
+        }
+    
+    def _fit_to_budget(self, exception_info: ExceptionInfo) -> Tuple[List[str], List[str]]:
+        """Drop context lines furthest from the exception, then the deepest frames, until the prompt fits MAX_PROMPT_TOKENS"""
+        stack_trace = list(exception_info.stack_trace)
+        context = list(exception_info.surrounding_context)
+        
+        tokens = (self.static_prompt_tokens
+                  + estimate_tokens(exception_info.exception_type)
+                  + estimate_tokens(exception_info.exception_message)
+                  + sum(estimate_tokens(line) for line in stack_trace)
+                  + sum(estimate_tokens(line) for line in context))
+        
+        # Context is in log order, so the first line is the furthest from the exception
+        while tokens > MAX_PROMPT_TOKENS and context:
+            tokens -= estimate_tokens(context.pop(0))
         
-        # Create the prompt
-        prompt = self.prompt_template.format_messages(
+        # Always keep the top frame, it is where the exception was thrown
+        while tokens > MAX_PROMPT_TOKENS and len(stack_trace) > 1:
+            tokens -= estimate_tokens(stack_trace.pop())
+        
+        return stack_trace, context
+    
+    def _fix_from_data(self, exception_info: ExceptionInfo, fix_data: Dict[str, Any]) -> CodeFix:
+        """Create a CodeFix from parsed (or cached) fix data"""
+        return CodeFix(
             exception_type=exception_info.exception_type,
             exception_message=exception_info.exception_message,
-            timestamp=exception_info.timestamp,
-            log_level=exception_info.log_level,
-            file_path=exception_info.file_path or "Unknown",
-            line_number=exception_info.line_number or "Unknown",
-            method_name=exception_info.method_name or "Unknown",
-            class_name=exception_info.class_name or "Unknown",
-            stack_trace=stack_trace_str,
-            surrounding_context=context_str
+            root_cause=fix_data.get("root_cause", "Unknown"),
+            fix_description=fix_data.get("fix_description", "No description available"),
+            code_suggestions=fix_data.get("code_suggestions", []),
+            prevention_tips=fix_data.get("prevention_tips", []),
+            confidence_score=fix_data.get("confidence_score", 0.5)
         )
-        
+    
+    def _fix_from_response(self, exception_info: ExceptionInfo, response: Any, cache_key: str) -> CodeFix:
+        """Parse an LLM response into a CodeFix, caching the fix data when the response parsed"""
         try:
-            # Get the LLM response
-            response = self.llm.invoke(prompt)
-            #print(f"LLM response: {response_content}")
             # Parse the JSON response
             try:
-                # Replace ``` with empty string to avoid JSON parsing issues
-                response_content = response.content.replace("```", "")
-                response_content = response_content.replace("json", "")
+                response_content = response.content
                 print(f"LLM response: {response_content}")
-                fix_data = json.loads(response_content)
-            except json.JSONDecodeError:
+                # Take the outermost {...} block so markdown fences or prose around the JSON are ignored
+                json_match = self.json_block_pattern.search(response_content)
+                fix_data = parse_json(json_match.group(0) if json_match else response_content)
+                # Valid JSON that is not an object (a list, a string, null) is no fix; never cache it
+                if not isinstance(fix_data, dict):
+                    raise json.JSONDecodeError("Expected a JSON object", response_content, 0)
+                self.cache.set(cache_key, fix_data)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
                 # Fallback if JSON parsing fails
                 fix_data = {
                     "root_cause": "Unable to parse LLM response",
@@ -146,43 +320,88 @@ Format your response as JSON with the following structure:
                     "confidence_score": 0.3
                 }
             
-            # Create CodeFix object
-            code_fix = CodeFix(
-                exception_type=exception_info.exception_type,
-                exception_message=exception_info.exception_message,
-                root_cause=fix_data.get("root_cause", "Unknown"),
-                fix_description=fix_data.get("fix_description", "No description available"),
-                code_suggestions=fix_data.get("code_suggestions", []),
-                prevention_tips=fix_data.get("prevention_tips", []),
-                confidence_score=fix_data.get("confidence_score", 0.5)
-            )
+            return self._fix_from_data(exception_info, fix_data)
             
-            return code_fix
+        except Exception as e:
+            return self._error_fix(exception_info, e)
+    
+    def _fixes_from_batch_response(self, exceptions: List[ExceptionInfo], response: Any,
+                                   cache_keys: List[str]) -> List[CodeFix]:
+        """Parse a batch LLM response (a JSON list keyed by exception number) into one CodeFix per exception"""
+        try:
+            response_content = response.content
+            try:
+                json_match = self.json_list_pattern.search(response_content)
+                items = parse_json(json_match.group(0) if json_match else response_content)
+                if not isinstance(items, list):
+                    raise json.JSONDecodeError("Expected a JSON list", response_content, 0)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
+                # Fallback if JSON parsing fails, shared by every exception of the batch
+                fix_data = {
+                    "root_cause": "Unable to parse LLM response",
+                    "fix_description": response_content[:500],
+                    "code_suggestions": [],
+                    "prevention_tips": [],
+                    "confidence_score": 0.3
+                }
+                return [self._fix_from_data(exception, fix_data) for exception in exceptions]
+            
+            # Prefer the index the model reported, fall back to the position in the list
+            by_index = {}
+            for position, item in enumerate(items):
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    # Models sometimes quote the number ("index": "0")
+                    index = int(item.get("index", position))
+                except (TypeError, ValueError):
+                    continue
+                by_index.setdefault(index, item)
+            
+            fixes = []
+            for i, (exception, cache_key) in enumerate(zip(exceptions, cache_keys)):
+                fix_data = by_index.get(i)
+                # Only JSON objects are fixes; anything else must not reach the cache
+                if not isinstance(fix_data, dict):
+                    fixes.append(self._error_fix(exception, ValueError(f"No fix for exception {i} in batch response")))
+                    continue
+                self.cache.set(cache_key, fix_data)
+                fixes.append(self._fix_from_data(exception, fix_data))
+            return fixes
             
         except Exception as e:
-            # Return a basic fix if LLM call fails
-            return CodeFix(
-                exception_type=exception_info.exception_type,
-                exception_message=exception_info.exception_message,
-                root_cause=f"Error analyzing exception: {str(e)}",
-                fix_description="Unable to generate fix due to analysis error",
-                code_suggestions=[],
-                prevention_tips=[],
-                confidence_score=0.0
-            )
+            return [self._error_fix(exception, e) for exception in exceptions]
     
-    def analyze_multiple_exceptions(self, exceptions: List[ExceptionInfo]) -> List[CodeFix]:
-        """Analyze multiple exceptions and generate fixes for each"""
-        fixes = []
+    def _error_fix(self, exception_info: ExceptionInfo, error: Exception) -> CodeFix:
+        """Return a basic fix if the LLM call or response handling fails"""
+        return CodeFix(
+            exception_type=exception_info.exception_type,
+            exception_message=exception_info.exception_message,
+            root_cause=f"Error analyzing exception: {str(error)}",
+            fix_description="Unable to generate fix due to analysis error",
+            code_suggestions=[],
+            prevention_tips=[],
+            confidence_score=0.0
+        )
+    
+    def _prepare_prompts(self, exceptions: List[ExceptionInfo],
+                         model: Optional[str] = None) -> Tuple[List[Optional[CodeFix]], List[Tuple[int, str, List[Any]]]]:
+        """Resolve cache hits and build prompts for the rest; exceptions whose prompt cannot be built get a placeholder fix"""
+        fixes: List[Optional[CodeFix]] = [None] * len(exceptions)
+        pending = []
         
-        for exception in exceptions:
+        for i, exception in enumerate(exceptions):
             try:
-                fix = self.analyze_exception(exception)
-                fixes.append(fix)
+                cache_key = self.cache_key(exception, model)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    fixes[i] = self._fix_from_data(exception, cached)
+                    continue
+                pending.append((i, cache_key, self._build_prompt(exception)))
             except Exception as e:
                 print(f"Error analyzing exception {exception.exception_type}: {str(e)}")
                 # Add a placeholder fix
-                fixes.append(CodeFix(
+                fixes[i] = CodeFix(
                     exception_type=exception.exception_type,
                     exception_message=exception.exception_message,
                     root_cause=f"Analysis failed: {str(e)}",
@@ -190,13 +409,241 @@ Format your response as JSON with the following structure:
                     code_suggestions=[],
                     prevention_tips=[],
                     confidence_score=0.0
-                ))
+                )
+        
+        return fixes, pending
+    
+    def analyze_exception(self, exception_info: ExceptionInfo, model: Optional[str] = None) -> CodeFix:
+        """Analyze a single exception and generate code fixes with the given model"""
+        cache_key = self.cache_key(exception_info, model)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return self._fix_from_data(exception_info, cached)
+        
+        try:
+            # Get the LLM response
+            response = self.llm_for(model).invoke(self._build_prompt(exception_info))
+        except Exception as e:
+            return self._error_fix(exception_info, e)
+        
+        return self._fix_from_response(exception_info, response, cache_key)
+    
+    async def aanalyze_exception(self, exception_info: ExceptionInfo, model: Optional[str] = None) -> CodeFix:
+        """Async variant of analyze_exception for event-loop callers"""
+        cache_key = self.cache_key(exception_info, model)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return self._fix_from_data(exception_info, cached)
+        
+        try:
+            response = await self.llm_for(model).ainvoke(self._build_prompt(exception_info))
+        except Exception as e:
+            return self._error_fix(exception_info, e)
+        
+        return self._fix_from_response(exception_info, response, cache_key)
+    
+    @staticmethod
+    def duplicate_signature(exception: ExceptionInfo) -> Tuple[str, str, Tuple[str, ...]]:
+        """Signature under which exceptions count as duplicates of each other"""
+        return exception.exception_type, exception.exception_message[:200], tuple(exception.stack_trace[:3])
+    
+    def group_duplicates(self, exceptions: List[ExceptionInfo]) -> Tuple[List[ExceptionInfo], List[int]]:
+        """Collapse exceptions sharing a signature; returns the unique exceptions and the group index of every input"""
+        groups: Dict[Tuple[str, str, Tuple[str, ...]], int] = {}
+        unique_exceptions = []
+        group_indices = []
+        
+        for exception in exceptions:
+            signature = self.duplicate_signature(exception)
+            if signature not in groups:
+                groups[signature] = len(unique_exceptions)
+                unique_exceptions.append(exception)
+            group_indices.append(groups[signature])
+        
+        return unique_exceptions, group_indices
+    
+    def expand_duplicates(self, unique_fixes: List[CodeFix], group_indices: List[int]) -> List[CodeFix]:
+        """Fan the fix of each unique exception back out to all of its occurrences"""
+        counts = Counter(group_indices)
+        group_fixes = [replace(fix, duplicate_count=counts[i]) for i, fix in enumerate(unique_fixes)]
+        return [group_fixes[i] for i in group_indices]
+    
+    def analyze_multiple_exceptions(self, exceptions: List[ExceptionInfo]) -> List[CodeFix]:
+        """Analyze multiple exceptions and generate fixes for each, running the LLM calls concurrently"""
+        unique_exceptions, group_indices = self.group_duplicates(exceptions)
+        fixes = self._analyze_unique(unique_exceptions)
+        return self.expand_duplicates(fixes, group_indices)
+    
+    def _analyze_unique(self, exceptions: List[ExceptionInfo]) -> List[CodeFix]:
+        """Generate one fix per exception with concurrent LLM calls"""
+        fixes, pending = self._prepare_prompts(exceptions)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                # Submit every call before collecting any result so the round-trips overlap
+                futures = [(i, cache_key, executor.submit(self.llm.invoke, prompt)) for i, cache_key, prompt in pending]
+                
+                for i, cache_key, future in futures:
+                    try:
+                        # Call result() exactly once per future and keep the value; calling it again
+                        # (e.g. once in a check and once to use it) is an easy way to serialize the pool
+                        response = future.result()
+                    except Exception as e:
+                        fixes[i] = self._error_fix(exceptions[i], e)
+                    else:
+                        fixes[i] = self._fix_from_response(exceptions[i], response, cache_key)
+        
+        return fixes
+    
+    async def aanalyze_multiple_exceptions(self, exceptions: List[ExceptionInfo]) -> List[CodeFix]:
+        """Async variant of analyze_multiple_exceptions for event-loop callers"""
+        unique_exceptions, group_indices = self.group_duplicates(exceptions)
+        fixes, pending = self._prepare_prompts(unique_exceptions)
+        
+        if pending:
+            responses = await self.llm.abatch(
+                [prompt for _, _, prompt in pending],
+                config={"max_concurrency": self.max_workers},
+                return_exceptions=True
+            )
+            
+            for (i, cache_key, _), response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    fixes[i] = self._error_fix(unique_exceptions[i], response)
+                else:
+                    fixes[i] = self._fix_from_response(unique_exceptions[i], response, cache_key)
+        
+        return self.expand_duplicates(fixes, group_indices)
+    
+    def _prepare_batches(self, exceptions: List[ExceptionInfo], batch_size: int,
+                         model: Optional[str] = None) -> Tuple[List[Optional[CodeFix]], List[Tuple[List[int], List[str], List[Any]]]]:
+        """Resolve cache hits and pack the remaining exceptions into batch prompts of up to batch_size"""
+        fixes: List[Optional[CodeFix]] = [None] * len(exceptions)
+        pending = []
+        
+        for i, exception in enumerate(exceptions):
+            cache_key = self.cache_key(exception, model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                fixes[i] = self._fix_from_data(exception, cached)
+            else:
+                pending.append((i, cache_key))
+        
+        batches = []
+        for start in range(0, len(pending), batch_size):
+            indices = [i for i, _ in pending[start:start + batch_size]]
+            cache_keys = [cache_key for _, cache_key in pending[start:start + batch_size]]
+            try:
+                batches.append((indices, cache_keys, self._build_batch_prompt([exceptions[i] for i in indices])))
+            except Exception as e:
+                for i in indices:
+                    fixes[i] = self._error_fix(exceptions[i], e)
+        
+        return fixes, batches
+    
+    def analyze_batch(self, exceptions: List[ExceptionInfo], batch_size: Optional[int] = None,
+                      model: Optional[str] = None) -> List[CodeFix]:
+        """Generate one fix per exception, packing up to batch_size exceptions into each LLM call of the given model"""
+        fixes, batches = self._prepare_batches(exceptions, batch_size or self.batch_size, model)
+        llm = self.llm_for(model)
+        
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                futures = [(indices, cache_keys, executor.submit(llm.invoke, prompt)) for indices, cache_keys, prompt in batches]
+                
+                for indices, cache_keys, future in futures:
+                    batch_exceptions = [exceptions[i] for i in indices]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        batch_fixes = [self._error_fix(exception, e) for exception in batch_exceptions]
+                    else:
+                        batch_fixes = self._fixes_from_batch_response(batch_exceptions, response, cache_keys)
+                    for i, fix in zip(indices, batch_fixes):
+                        fixes[i] = fix
+        
+        return fixes
+    
+    async def aanalyze_batch(self, exceptions: List[ExceptionInfo], batch_size: Optional[int] = None,
+                             model: Optional[str] = None) -> List[CodeFix]:
+        """Async variant of analyze_batch for event-loop callers"""
+        fixes, batches = self._prepare_batches(exceptions, batch_size or self.batch_size, model)
+        
+        if batches:
+            responses = await self.llm_for(model).abatch(
+                [prompt for _, _, prompt in batches],
+                config={"max_concurrency": self.max_workers},
+                return_exceptions=True
+            )
+            
+            for (indices, cache_keys, _), response in zip(batches, responses):
+                batch_exceptions = [exceptions[i] for i in indices]
+                if isinstance(response, Exception):
+                    batch_fixes = [self._error_fix(exception, response) for exception in batch_exceptions]
+                else:
+                    batch_fixes = self._fixes_from_batch_response(batch_exceptions, response, cache_keys)
+                for i, fix in zip(indices, batch_fixes):
+                    fixes[i] = fix
+        
+        return fixes
+    
+    def _batch_api_request(self, prompt: List[Any], llm: Any) -> Dict[str, Any]:
+        """Convert a chat prompt from _build_prompt into a Gemini Batch API inline request"""
+        system_message, human_message = prompt
+        return {
+            "contents": [{"role": "user", "parts": [{"text": human_message.content}]}],
+            "config": {
+                "system_instruction": {"parts": [{"text": system_message.content}]},
+                "temperature": llm.temperature
+            }
+        }
+    
+    async def aanalyze_with_batch_api(self, exceptions: List[ExceptionInfo], poll_interval: float = 30.0,
+                                      model: Optional[str] = None) -> List[CodeFix]:
+        """Generate one fix per exception through the Gemini Batch API (half the price, for offline runs)"""
+        fixes, pending = self._prepare_prompts(exceptions, model)
+        llm = self.llm_for(model)
+        
+        if not pending:
+            return fixes
+        
+        try:
+            # Imported here so the google-genai SDK is only needed when the Batch API is used
+            from google import genai
+            
+            client = genai.Client()
+            job = await client.aio.batches.create(
+                model=llm.model,
+                src=[self._batch_api_request(prompt, llm) for _, _, prompt in pending],
+                config={"display_name": "spring-boot-log-fixes"}
+            )
+            
+            # Batch jobs are queued and can take minutes to hours
+            while job.state.name not in BATCH_JOB_DONE_STATES:
+                await asyncio.sleep(poll_interval)
+                job = await client.aio.batches.get(name=job.name)
+            
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise RuntimeError(f"Batch job {job.name} ended in state {job.state.name}")
+            
+            # Inline responses come back in request order
+            responses = job.dest.inlined_responses
+        except Exception as e:
+            for i, _, _ in pending:
+                fixes[i] = self._error_fix(exceptions[i], e)
+            return fixes
+        
+        for (i, cache_key, _), inlined in zip(pending, responses):
+            if inlined.error:
+                fixes[i] = self._error_fix(exceptions[i], RuntimeError(str(inlined.error)))
+            else:
+                fixes[i] = self._fix_from_response(exceptions[i], AIMessage(content=inlined.response.text), cache_key)
         
         return fixes
     
     def format_fix_report(self, fix: CodeFix) -> str:
         """Format a code fix as a readable report"""
-        report = f"""
+        parts = [f"""
 === CODE FIX ANALYSIS ===
 Exception: {fix.exception_type}
 Message: {fix.exception_message}
@@ -209,10 +656,10 @@ FIX DESCRIPTION:
 {fix.fix_description}
 
 CODE SUGGESTIONS:
-"""
+"""]
         
         for i, suggestion in enumerate(fix.code_suggestions, 1):
-            report += f"""
+            parts.append(f"""
 {i}. File: {suggestion.get('file', 'Unknown')}
    Method: {suggestion.get('method', 'Unknown')}
    Description: {suggestion.get('description', 'No description')}
@@ -225,13 +672,13 @@ CODE SUGGESTIONS:
    ```
    
    Explanation: {suggestion.get('explanation', 'No explanation')}
-"""
+""")
         
-        report += "\nPREVENTION TIPS:\n"
-        for i, tip in enumerate(fix.prevention_tips, 1):
-            report += f"{i}. {tip}\n"
+        parts.append("\nPREVENTION TIPS:\n")
+        parts.extend(f"{i}. {tip}\n" for i, tip in enumerate(fix.prevention_tips, 1))
         
-        return report
+        # Join once instead of growing a string with += in the loops
+        return "".join(parts)
     
     @tool
     def fix_exceptions(self, exceptions_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -305,5 +752,6 @@ if __name__ == "__main__":
     print("Available methods:")
     print("- analyze_exception(exception_info): Analyze a single exception")
     print("- analyze_multiple_exceptions(exceptions): Analyze multiple exceptions")
+    print("- analyze_batch(exceptions): Analyze several exceptions per LLM call")
     print("- fix_exceptions(exceptions_data): Tool version for LangGraph integration")
 
@@ -0,0 +1,106 @@
+"""
+Shared pytest fixtures for the Spring Boot Log Analyzer test suite
+
+The sample log analysis and the complete workflow are the expensive parts of the suite,
+so they run once per test session and are shared read-only by the tests.
+"""
+
+import os
+import re
+from typing import List, Dict, Any
+
+import pytest
+from flask.testing import FlaskClient
+
+import app
+from log_analysis_agent import LogAnalysisAgent, ExceptionInfo, LOG_LINE_PATTERN
+from code_fixing_agent import CodeFixingAgent
+from multi_agent_orchestrator import SpringBootLogAnalyzer
+
+
+SAMPLE_LOG_PATH = "sample_spring_boot.log"
+# Resolved once at import; the sample log does not change during a test session
+SAMPLE_LOG_EXISTS = os.path.exists(SAMPLE_LOG_PATH)
+SAMPLE_REPORT_PATH = f"analysis_report_{os.path.basename(SAMPLE_LOG_PATH)}.md"
+
+
+def pytest_collection_modifyitems(items):
+    """Run the tests that need the complete workflow first
+
+    The session-scoped workflow_result is then built up front, and under --exitfirst a broken
+    pipeline stops the run before any of the cheaper tests.
+    """
+    items.sort(key=lambda item: "workflow_result" not in getattr(item, "fixturenames", ()))
+
+
+@pytest.fixture(scope="session")
+def sample_log_path() -> str:
+    """Path of the sample Spring Boot log"""
+    return SAMPLE_LOG_PATH
+
+
+@pytest.fixture(scope="session")
+def sample_log_exists() -> bool:
+    """Whether the sample log is present"""
+    return SAMPLE_LOG_EXISTS
+
+
+@pytest.fixture(scope="session")
+def sample_report_path() -> str:
+    """Path of the report the workflow writes for the sample log"""
+    return SAMPLE_REPORT_PATH
+
+
+@pytest.fixture(scope="session")
+def log_line_pattern() -> re.Pattern:
+    """The compiled log line pattern, shared by every agent"""
+    return LOG_LINE_PATTERN
+
+
+@pytest.fixture
+def log_agent() -> LogAnalysisAgent:
+    """A fresh Log Analysis Agent"""
+    return LogAnalysisAgent()
+
+
+@pytest.fixture
+def fix_agent() -> CodeFixingAgent:
+    """A fresh Code Fixing Agent"""
+    return CodeFixingAgent()
+
+
+@pytest.fixture
+def analyzer() -> SpringBootLogAnalyzer:
+    """A fresh orchestrator; no fix cache or checkpoints on disk, so no earlier run affects the tests"""
+    return SpringBootLogAnalyzer(cache_path=None, checkpoint_path=None)
+
+
+@pytest.fixture
+def dashboard_client() -> FlaskClient:
+    """A test client of the dashboard app, with an empty parsed-report cache"""
+    app._parse_cached.cache_clear()
+    return app.app.test_client()
+
+
+@pytest.fixture(scope="session")
+def sample_log_lines() -> List[str]:
+    """Lines of the sample log, read once"""
+    return LogAnalysisAgent().read_log_file(SAMPLE_LOG_PATH)
+
+
+@pytest.fixture(scope="session")
+def sample_exceptions() -> List[ExceptionInfo]:
+    """Exceptions of the sample log"""
+    return LogAnalysisAgent().analyze_log_file(SAMPLE_LOG_PATH)
+
+
+@pytest.fixture(scope="session")
+def main_exceptions(sample_exceptions: List[ExceptionInfo]) -> List[ExceptionInfo]:
+    """Exceptions of the sample log with a full stack trace"""
+    return [exc for exc in sample_exceptions if exc.is_main]
+
+
+@pytest.fixture(scope="session")
+def workflow_result() -> Dict[str, Any]:
+    """Result of the complete workflow over the sample log"""
+    return SpringBootLogAnalyzer(cache_path=None, checkpoint_path=None).analyze_log_file(SAMPLE_LOG_PATH)
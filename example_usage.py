@@ -7,20 +7,39 @@ agentic application for analyzing log files and generating code fixes.
 """
 
 import os
+import re
 import sys
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 from multi_agent_orchestrator import SpringBootLogAnalyzer
 
 
-def example_basic_analysis():
+# Markdown heading lines of a report, matched on the raw bytes
+SECTION_RE = re.compile(rb"^#.*$", re.MULTILINE)
+
+
+# Analyzer of a batch worker process, built once per process by _init_batch_worker
+_worker_analyzer: Optional[SpringBootLogAnalyzer] = None
+
+
+def _init_batch_worker():
+    """Set up the analyzer a batch worker process reuses for every file it is given"""
+    global _worker_analyzer
+    _worker_analyzer = SpringBootLogAnalyzer()
+    _worker_analyzer.warmup()
+
+
+def _analyze_in_worker(log_file: str) -> Dict[str, Any]:
+    """Analyze one log file with the worker's analyzer"""
+    return _worker_analyzer.analyze_log_file(log_file)
+
+
+def example_basic_analysis(analyzer: SpringBootLogAnalyzer):
     """Example 1: Basic log file analysis"""
     print("=" * 60)
     print("EXAMPLE 1: Basic Log File Analysis")
     print("=" * 60)
     
-    # Initialize the analyzer
-    analyzer = SpringBootLogAnalyzer()
-    
     # Analyze the sample log file
     log_file = "sample_spring_boot.log"
     
@@ -57,25 +76,22 @@ def example_basic_analysis():
         print(f"❌ Analysis failed: {result['error']}")
 
 
-def example_detailed_exception_analysis():
+def example_detailed_exception_analysis(analyzer: SpringBootLogAnalyzer):
     """Example 2: Detailed analysis of specific exceptions"""
     print("\n" + "=" * 60)
     print("EXAMPLE 2: Detailed Exception Analysis")
     print("=" * 60)
     
-    from log_analysis_agent import LogAnalysisAgent
-    from code_fixing_agent import CodeFixingAgent
-    
-    # Initialize agents
-    log_agent = LogAnalysisAgent()
-    fix_agent = CodeFixingAgent()
+    # Use the analyzer's agents directly
+    log_agent = analyzer.log_agent
+    fix_agent = analyzer.fix_agent
     
     # Analyze log file
     log_file = "sample_spring_boot.log"
     exceptions = log_agent.analyze_log_file(log_file)
     
     # Filter to main exceptions only
-    main_exceptions = [exc for exc in exceptions if exc.stack_trace and len(exc.stack_trace) > 5]
+    main_exceptions = [exc for exc in exceptions if exc.is_main]
     
     print(f"Found {len(main_exceptions)} main exceptions to analyze:")
     
@@ -110,34 +126,49 @@ def example_batch_processing():
     if os.path.exists("additional_test.log"):
         log_files.append("additional_test.log")
     
-    analyzer = SpringBootLogAnalyzer()
     batch_results = []
     
     print(f"Processing {len(log_files)} log files...")
     
+    existing_files = []
     for log_file in log_files:
-        print(f"\n📁 Processing: {log_file}")
-        
-        if not os.path.exists(log_file):
+        if os.path.exists(log_file):
+            existing_files.append(log_file)
+        else:
             print(f"   ❌ File not found: {log_file}")
-            continue
-        
-        result = analyzer.analyze_log_file(log_file)
-        
-        batch_result = {
-            'file': log_file,
-            'success': result['success'],
-            'exceptions': result['total_exceptions'],
-            'fixes': result['total_fixes'],
-            'error': result.get('error', '')
-        }
-        
-        batch_results.append(batch_result)
+    
+    if not existing_files:
+        return
+    
+    # Files are independent: analyze them in parallel, each worker process reusing one warmed-up analyzer
+    workers = min(len(existing_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        futures = {executor.submit(_analyze_in_worker, log_file): log_file for log_file in existing_files}
         
-        if result['success']:
-            print(f"   ✅ Success: {result['total_exceptions']} exceptions, {result['total_fixes']} fixes")
-        else:
-            print(f"   ❌ Failed: {result['error']}")
+        # Report each file as soon as it is done, so a slow file does not hold up the others
+        for future in as_completed(futures):
+            log_file = futures[future]
+            print(f"\n📁 Processed: {log_file}")
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'total_exceptions': 0, 'total_fixes': 0, 'error': str(e)}
+            
+            batch_result = {
+                'file': log_file,
+                'success': result['success'],
+                'exceptions': result.get('total_exceptions', 0),
+                'fixes': result.get('total_fixes', 0),
+                'error': result.get('error', '')
+            }
+            
+            batch_results.append(batch_result)
+            
+            if result['success']:
+                print(f"   ✅ Success: {result['total_exceptions']} exceptions, {result['total_fixes']} fixes")
+            else:
+                print(f"   ❌ Failed: {result['error']}")
     
     # Summary
     print(f"\n📊 Batch Processing Summary:")
@@ -151,15 +182,13 @@ def example_batch_processing():
     print(f"   Total fixes: {total_fixes}")
 
 
-def example_custom_log_analysis():
+def example_custom_log_analysis(analyzer: SpringBootLogAnalyzer):
     """Example 4: Custom log analysis with filtering"""
     print("\n" + "=" * 60)
     print("EXAMPLE 4: Custom Log Analysis with Filtering")
     print("=" * 60)
     
-    from log_analysis_agent import LogAnalysisAgent
-    
-    log_agent = LogAnalysisAgent()
+    log_agent = analyzer.log_agent
     log_file = "sample_spring_boot.log"
     
     # Get all exceptions
@@ -207,37 +236,35 @@ def example_report_analysis():
         print(f"\n📄 Report: {report_file}")
         
         try:
-            with open(report_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(report_file, 'rb') as f:
+                data = f.read()
             
-            # Basic report statistics
-            lines = content.split('\n')
-            sections = [line for line in lines if line.startswith('#')]
-            code_blocks = content.count('```')
+            # Basic report statistics, counted on the bytes without splitting or decoding the report
+            total_lines = data.count(b'\n') + 1
+            sections = SECTION_RE.findall(data)
+            code_blocks = data.count(b'```')
             
             print(f"   📊 Report Statistics:")
-            print(f"     Total lines: {len(lines)}")
+            print(f"     Total lines: {total_lines}")
             print(f"     Sections: {len(sections)}")
             print(f"     Code blocks: {code_blocks // 2}")  # Each code block has opening and closing ```
-            print(f"     File size: {len(content)} characters")
+            print(f"     File size: {len(data)} bytes")
             
-            # Show first few sections
+            # Show first few sections; only these get decoded
             print(f"   📋 Sections:")
             for section in sections[:5]:
-                print(f"     {section}")
+                print(f"     {section.decode('utf-8', 'replace').rstrip()}")
             
         except Exception as e:
             print(f"   ❌ Error reading report: {e}")
 
 
-def example_error_handling():
+def example_error_handling(analyzer: SpringBootLogAnalyzer):
     """Example 6: Error handling and edge cases"""
     print("\n" + "=" * 60)
     print("EXAMPLE 6: Error Handling and Edge Cases")
     print("=" * 60)
     
-    analyzer = SpringBootLogAnalyzer()
-    
     # Test 1: Non-existent file
     print("🧪 Test 1: Non-existent file")
     result = analyzer.analyze_log_file("non_existent_file.log")
@@ -293,13 +320,17 @@ def main():
         print("Set your API key: export GEMINI_API_KEY='your-key-here'\n")
     
     try:
+        # One analyzer, set up once, is shared by all examples
+        analyzer = SpringBootLogAnalyzer()
+        analyzer.warmup()
+        
         # Run all examples
-        example_basic_analysis()
-        example_detailed_exception_analysis()
+        example_basic_analysis(analyzer)
+        example_detailed_exception_analysis(analyzer)
         example_batch_processing()
-        example_custom_log_analysis()
+        example_custom_log_analysis(analyzer)
         example_report_analysis()
-        example_error_handling()
+        example_error_handling(analyzer)
         
         print("\n" + "=" * 60)
         print("🎉 All examples completed successfully!")
@@ -0,0 +1,138 @@
+"""
+LLM Response Cache for the Code Fixing Agent
+
+Log files tend to repeat the same exception many times. This module caches the
+parsed LLM fix data keyed by a fingerprint of the exception so that repeated
+exceptions are answered without another LLM round-trip. The SQLite backend keeps
+the cache across runs.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Protocol
+
+from cachetools import TTLCache
+
+from log_analysis_agent import ExceptionInfo
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+class CacheBackend(Protocol):
+    """Storage interface used by LLMCache (in-process by default, swappable for Redis etc.)"""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU + TTL backend built on cachetools"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86400):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # cachetools caches are not thread-safe on their own
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+
+# Default location of the persistent fix cache shared by runs
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "singham", "fixes.db")
+
+
+class SqliteCacheBackend:
+    """Persistent backend in a SQLite file, so re-runs over overlapping logs skip the LLM"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        # One connection shared by the fix threads; sqlite3 connections need external locking for that
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL lets several processes read the cache while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fixes (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM fixes WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return orjson.loads(row[0]) if orjson is not None else json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fixes (key, value, created) VALUES (?, ?, ?)",
+                (key, orjson.dumps(value).decode("utf-8") if orjson is not None else json.dumps(value), time.time())
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMCache:
+    """Cache of parsed LLM fix data keyed by exception fingerprint"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.stats = {"hits": 0, "misses": 0}
+        # get() runs on the fix threads concurrently, and += on the counters is not atomic
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def key_for(exception_info: ExceptionInfo, model: str, prompt_version: str) -> str:
+        """BLAKE2b of the normalized exception signature (type, message, top of stack) and of what produced the fix
+        
+        The model and the prompt version are part of the key, so a fix cached for another model
+        or for older prompts is never served.
+        """
+        # Stays on the json module: keys are persisted, so they must not depend on whether orjson is installed
+        signature = json.dumps({
+            "model": model,
+            "prompt": prompt_version,
+            "type": exception_info.exception_type,
+            "msg": exception_info.exception_message,
+            "top": exception_info.stack_trace[:3]
+        }, sort_keys=True)
+        return hashlib.blake2b(signature.encode("utf-8"), digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached fix data for the key, or None on a miss"""
+        value = self.backend.get(key)
+        if not isinstance(value, dict):
+            # Also covers entries that are not fix objects, stored before set() checked its value
+            value = None
+        with self._stats_lock:
+            self.stats["misses" if value is None else "hits"] += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store parsed fix data for the key; anything but a dict is rejected, a cache hit must be a fix"""
+        if not isinstance(value, dict):
+            raise TypeError(f"Fix data must be a dict, not {type(value).__name__}")
+        self.backend.set(key, value)
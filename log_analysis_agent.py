@@ -8,18 +8,111 @@ This agent reads SLF4J log files and extracts exception information including:
 - Timestamp and log level
 """
 
+from __future__ import annotations
+
+import asyncio
+import heapq
 import re
 import os
-from typing import List, Dict, Optional, Any
+import io
+import mmap
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Optional, Any, AsyncIterator, Deque, Generator, Iterator, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; fall back to the re module
+    hyperscan = None
+
+
+# Stack trace lines kept per exception; the code fixing prompt never uses more
+MAX_STACK_TRACE_LINES = 15
+
+# Common Spring Boot log patterns, ordered by how often they match in practice.
+# The order also matters for correctness: 'simple' accepts every 'alternative' line.
+_LOG_PATTERN_SOURCES = (
+    # Standard Spring Boot log pattern: timestamp [level] pid --- [thread] logger : message
+    ('spring_boot',
+     r'(?P<sb_timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+(?P<sb_level>\w+)\s+\d+\s+---\s+'
+     r'\[(?P<sb_thread>[^\]]+)\]\s+(?P<sb_logger>[^:]+)\s*:\s*(?P<sb_message>.*)'),
+    # Alternative log pattern
+    ('alternative',
+     r'(?P<alt_timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(?P<alt_level>\w+)\s+(?P<alt_message>.*)'),
+    # Simple timestamp pattern
+    ('simple',
+     r'(?P<simple_timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(?P<simple_message>.*)')
+)
+LOG_PATTERNS = tuple((name, re.compile(source)) for name, source in _LOG_PATTERN_SOURCES)
+
+# All formats in one alternation so a single match per line both recognizes
+# the line and tells which format it is (the first matching branch wins)
+LOG_LINE_PATTERN = re.compile('|'.join(f'(?:{source})' for _, source in _LOG_PATTERN_SOURCES))
+
+# Exception patterns
+EXCEPTION_PATTERNS = {
+    'exception_line': re.compile(r'(\w+(?:\.\w+)*Exception):\s*(.*?)(?:\s+at\s+|$)'),
+    'caused_by': re.compile(r'Caused by:\s+(\w+(?:\.\w+)*Exception):\s*(.*?)(?:\s+at\s+|$)'),
+    'stack_trace': re.compile(r'\s+at\s+([^(]+)\(([^:]+):(\d+)\)'),
+    'more_lines': re.compile(r'\s+\.\.\.\s+(\d+)\s+more')
+}
+
+# Exception declarations in a single alternation; the negative lookahead rejects
+# stack trace lines ("at ..." / "... N more") so they are not treated as new exceptions
+EXCEPTION_LINE_PATTERN = re.compile(
+    r'^(?!\s*(?:at |\.\.\.)).*?'
+    r'(?:\w+Exception:|\w+Error:|Caused by:\s+\w+|Exception in thread'
+    r'|java\.(?:lang|io|sql)\.\w+Exception|org\.springframework\.\w+Exception)',
+    re.DOTALL
+)
+
+# Bytes twins of the line and exception patterns, so anchor hits that are not
+# exceptions can be rejected without decoding the line
+LOG_LINE_BYTES_PATTERN = re.compile(LOG_LINE_PATTERN.pattern.encode())
+EXCEPTION_LINE_BYTES_PATTERN = re.compile(EXCEPTION_LINE_PATTERN.pattern.encode(), re.DOTALL)
+# \w, \s and strip() only agree between str and bytes on plain ASCII (\x1c-\x1f are str whitespace)
+NON_PLAIN_ASCII_PATTERN = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+LINE_BREAK_PATTERN = re.compile(rb'[\r\n]')
+
+# Literals of which every exception declaration contains at least one, used to jump
+# straight to candidate lines in the raw file before running the full per-line checks
+EXCEPTION_ANCHORS = (b'Exception', b'Error:', b'Caused by:')
+
+# Bytes scanned per Hyperscan call, so anchor hits are produced as the scan goes instead of all up front
+ANCHOR_SCAN_CHUNK_SIZE = 1 << 20
+
+
+def _literal_offsets(data: mmap.mmap, literal: bytes) -> Iterator[int]:
+    """Start offsets of every occurrence of literal in data, in ascending order"""
+    find = data.find
+    offset = find(literal)
+    while offset != -1:
+        yield offset
+        offset = find(literal, offset + 1)
+
+
+def _compile_anchor_database() -> Optional[Any]:
+    """Compile EXCEPTION_ANCHORS into a Hyperscan block-mode database when hyperscan is installed"""
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(anchor) for anchor in EXCEPTION_ANCHORS],
+        ids=list(range(len(EXCEPTION_ANCHORS))),
+        elements=len(EXCEPTION_ANCHORS)
+    )
+    return database
 
 
-@dataclass
+EXCEPTION_ANCHOR_DATABASE = _compile_anchor_database()
+
+
+@dataclass(slots=True)
 class ExceptionInfo:
     """Data class to hold extracted exception information"""
     timestamp: str
@@ -32,80 +125,79 @@ class ExceptionInfo:
     line_number: Optional[int] = None
     method_name: Optional[str] = None
     class_name: Optional[str] = None
+    is_main: bool = False  # Has a full stack trace (more than 5 lines); set once at parse time
 
 
 class LogAnalysisAgent:
     """Agent responsible for analyzing Spring Boot log files and extracting exception information"""
     
     def __init__(self):
-        #self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-        
-        # Common Spring Boot log patterns
-        self.log_patterns = {
-            # Standard Spring Boot log pattern: timestamp [level] pid --- [thread] logger : message
-            'spring_boot': re.compile(
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+(\w+)\s+\d+\s+---\s+\[([^\]]+)\]\s+([^:]+)\s*:\s*(.*)'
-            ),
-            # Alternative log pattern
-            'alternative': re.compile(
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(\w+)\s+(.*)'
-            ),
-            # Simple timestamp pattern
-            'simple': re.compile(
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(.*)'
-            )
-        }
-        
-        # Exception patterns
-        self.exception_patterns = {
-            'exception_line': re.compile(r'(\w+(?:\.\w+)*Exception):\s*(.*?)(?:\s+at\s+|$)'),
-            'caused_by': re.compile(r'Caused by:\s+(\w+(?:\.\w+)*Exception):\s*(.*?)(?:\s+at\s+|$)'),
-            'stack_trace': re.compile(r'\s+at\s+([^(]+)\(([^:]+):(\d+)\)'),
-            'more_lines': re.compile(r'\s+\.\.\.\s+(\d+)\s+more')
-        }
+        # Patterns are compiled once at import time and shared by all agents
+        self.log_patterns = LOG_PATTERNS
+        self.log_line_pattern = LOG_LINE_PATTERN
+        self.exception_patterns = EXCEPTION_PATTERNS
+        self.exception_line_pattern = EXCEPTION_LINE_PATTERN
+        self.line_break_pattern = LINE_BREAK_PATTERN
+        self.log_line_bytes_pattern = LOG_LINE_BYTES_PATTERN
+        self.exception_line_bytes_pattern = EXCEPTION_LINE_BYTES_PATTERN
+        self.non_plain_ascii_pattern = NON_PLAIN_ASCII_PATTERN
+    
+    def iter_log_file(self, file_path: str) -> Iterator[str]:
+        """Lazily yield the lines of a log file without loading it into memory"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                yield from file
+        except Exception as e:
+            raise Exception(f"Error reading log file {file_path}: {str(e)}")
     
     def read_log_file(self, file_path: str) -> List[str]:
         """Read log file and return lines"""
+        # One mapped read and one decode instead of buffered line-by-line reads; StringIO then splits
+        # with the same universal newline handling as iterating the file in text mode
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.readlines()
+            with open(file_path, 'rb') as file:
+                # mmap cannot map an empty file
+                if os.fstat(file.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    text = data[:].decode('utf-8')
         except Exception as e:
             raise Exception(f"Error reading log file {file_path}: {str(e)}")
+        return io.StringIO(text, newline=None).readlines()
     
     def parse_log_line(self, line: str) -> Optional[Dict[str, str]]:
         """Parse a single log line and extract timestamp, level, and message"""
         line = line.strip()
         if not line:
             return None
-            
-        # Try different log patterns
-        for pattern_name, pattern in self.log_patterns.items():
-            match = pattern.match(line)
-            if match:
-                if pattern_name == 'spring_boot':
-                    return {
-                        'timestamp': match.group(1),
-                        'level': match.group(2),
-                        'thread': match.group(3),
-                        'logger': match.group(4),
-                        'message': match.group(5),
-                        'raw_line': line
-                    }
-                elif pattern_name == 'alternative':
-                    return {
-                        'timestamp': match.group(1),
-                        'level': match.group(2),
-                        'message': match.group(3),
-                        'raw_line': line
-                    }
-                elif pattern_name == 'simple':
-                    return {
-                        'timestamp': match.group(1),
-                        'level': 'INFO',  # Default level
-                        'message': match.group(2),
-                        'raw_line': line
-                    }
+        
+        # Every log format starts with a date, so stack frames and other continuation
+        # lines are recognized by their first character without running the regex
+        match = self.log_line_pattern.match(line) if line[:1].isdigit() else None
+        if match:
+            if match['sb_timestamp'] is not None:
+                return {
+                    'timestamp': match['sb_timestamp'],
+                    'level': match['sb_level'],
+                    'thread': match['sb_thread'],
+                    'logger': match['sb_logger'],
+                    'message': match['sb_message'],
+                    'raw_line': line
+                }
+            elif match['alt_timestamp'] is not None:
+                return {
+                    'timestamp': match['alt_timestamp'],
+                    'level': match['alt_level'],
+                    'message': match['alt_message'],
+                    'raw_line': line
+                }
+            else:
+                return {
+                    'timestamp': match['simple_timestamp'],
+                    'level': 'INFO',  # Default level
+                    'message': match['simple_message'],
+                    'raw_line': line
+                }
         
         # If no pattern matches, treat as continuation line
         return {
@@ -116,38 +208,77 @@ class LogAnalysisAgent:
             'is_continuation': True
         }
     
+    def parse_log_line_bytes(self, line: bytes) -> Optional[Dict[str, Any]]:
+        """Bytes version of parse_log_line for undecoded plain ASCII lines; the values stay bytes"""
+        line = line.strip()
+        if not line:
+            return None
+        
+        match = self.log_line_bytes_pattern.match(line) if line[:1].isdigit() else None
+        if match:
+            if match['sb_timestamp'] is not None:
+                return {
+                    'timestamp': match['sb_timestamp'],
+                    'level': match['sb_level'],
+                    'thread': match['sb_thread'],
+                    'logger': match['sb_logger'],
+                    'message': match['sb_message'],
+                    'raw_line': line
+                }
+            elif match['alt_timestamp'] is not None:
+                return {
+                    'timestamp': match['alt_timestamp'],
+                    'level': match['alt_level'],
+                    'message': match['alt_message'],
+                    'raw_line': line
+                }
+            else:
+                return {
+                    'timestamp': match['simple_timestamp'],
+                    'level': b'INFO',  # Default level
+                    'message': match['simple_message'],
+                    'raw_line': line
+                }
+        
+        # If no pattern matches, treat as continuation line
+        return {
+            'timestamp': b'',
+            'level': b'',
+            'message': line,
+            'raw_line': line,
+            'is_continuation': True
+        }
+    
     def is_exception_line(self, message: str) -> bool:
         """Check if a log message contains an exception (but not stack trace lines)"""
-        # Don't treat stack trace lines as new exceptions
-        if message.strip().startswith('at ') or message.strip().startswith('...'):
+        # Every exception declaration contains one of EXCEPTION_ANCHORS; substring checks reject
+        # most log lines far more cheaply than the regex
+        if not ('Exception' in message or 'Error:' in message or 'Caused by:' in message):
             return False
-            
-        # Look for actual exception declarations
-        exception_patterns = [
-            r'\w+Exception:',
-            r'\w+Error:',
-            r'Caused by:\s+\w+',
-            r'Exception in thread',
-            r'java\.lang\.\w+Exception',
-            r'java\.io\.\w+Exception',
-            r'java\.sql\.\w+Exception',
-            r'org\.springframework\.\w+Exception'
-        ]
-        
-        return any(re.search(pattern, message) for pattern in exception_patterns)
+        return self.exception_line_pattern.match(message) is not None
     
-    def extract_exception_details(self, lines: List[Dict[str, str]], start_index: int) -> ExceptionInfo:
-        """Extract detailed exception information starting from the exception line"""
-        exception_line = lines[start_index]
-        stack_trace = []
-        surrounding_context = []
+    def is_stack_trace_line(self, line: Dict[str, str]) -> bool:
+        """Check if a parsed line continues the stack trace of a preceding exception"""
+        message = line['message']
         
-        # Get surrounding context (5 lines before)
-        context_start = max(0, start_index - 5)
-        for i in range(context_start, start_index):
-            if i < len(lines):
-                surrounding_context.append(lines[i]['raw_line'])
+        if self.exception_patterns['stack_trace'].match(message):
+            return True
+        elif self.exception_patterns['more_lines'].match(message):
+            return True
+        elif message.strip().startswith('at '):
+            return True
+        elif 'Caused by:' in message:
+            # This is a nested exception, include it in stack trace
+            return True
+        elif line.get('is_continuation', False) and message.strip():
+            # Continuation of exception message
+            return True
         
+        return False
+    
+    def build_exception_info(self, exception_line: Dict[str, str], surrounding_context: List[str],
+                             stack_trace: List[str]) -> ExceptionInfo:
+        """Build an ExceptionInfo from the exception line, its preceding context and its stack trace"""
         # Extract exception type and message
         exception_type = "Unknown"
         exception_message = exception_line['message']
@@ -161,31 +292,6 @@ class LogAnalysisAgent:
                     exception_message = match.group(2) if match.group(2) else exception_line['message']
                     break
         
-        # Extract stack trace (lines following the exception)
-        current_index = start_index + 1
-        while current_index < len(lines):
-            line = lines[current_index]
-            message = line['message']
-            
-            # Check if this is a stack trace line
-            if self.exception_patterns['stack_trace'].match(message):
-                stack_trace.append(message.strip())
-            elif self.exception_patterns['more_lines'].match(message):
-                stack_trace.append(message.strip())
-            elif message.strip().startswith('at '):
-                stack_trace.append(message.strip())
-            elif 'Caused by:' in message:
-                # This is a nested exception, include it in stack trace
-                stack_trace.append(message.strip())
-            elif line.get('is_continuation', False) and message.strip():
-                # Continuation of exception message
-                stack_trace.append(message.strip())
-            else:
-                # End of stack trace
-                break
-                
-            current_index += 1
-        
         # Extract file path, line number, method, and class from first stack trace line
         file_path = ""
         line_number = None
@@ -220,40 +326,244 @@ class LogAnalysisAgent:
             file_path=file_path,
             line_number=line_number,
             method_name=method_name,
-            class_name=class_name
+            class_name=class_name,
+            # Shorter traces are usually echoes of an exception that is logged in full elsewhere
+            is_main=len(stack_trace) > 5
         )
     
-    def analyze_log_file(self, file_path: str) -> List[ExceptionInfo]:
-        """Main method to analyze a log file and extract all exceptions"""
+    def extract_exception_details(self, lines: List[Dict[str, str]], start_index: int) -> ExceptionInfo:
+        """Extract detailed exception information starting from the exception line"""
+        # Get surrounding context (5 lines before)
+        context_start = max(0, start_index - 5)
+        surrounding_context = [line['raw_line'] for line in lines[context_start:start_index]]
+        
+        # Extract stack trace (lines following the exception)
+        stack_trace = []
+        for line in islice(lines, start_index + 1, None):
+            if not self.is_stack_trace_line(line) or len(stack_trace) == MAX_STACK_TRACE_LINES:
+                # End of stack trace
+                break
+            stack_trace.append(line['message'].strip())
+        
+        return self.build_exception_info(lines[start_index], surrounding_context, stack_trace)
+    
+    def iter_exceptions(self, file_path: str) -> Iterator[ExceptionInfo]:
+        """Stream exceptions from a log file, only decoding and parsing the lines around each exception"""
+        try:
+            file = open(file_path, 'rb')
+        except Exception as e:
+            raise Exception(f"Error reading log file {file_path}: {str(e)}")
+        
+        with file:
+            # mmap cannot map an empty file
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from self._scan_exceptions(data)
+    
+    def _scan_exceptions(self, data: mmap.mmap) -> Iterator[ExceptionInfo]:
+        """Jump between exception anchors with a C-level regex search instead of parsing every line"""
+        pos = 0
+        
+        for anchor in self._anchor_offsets(data):
+            if anchor < pos:
+                # Inside a line or stack trace that was already consumed
+                continue
+            
+            start = self._line_start(data, anchor)
+            end = self._line_end(data, anchor)
+            raw_line = data[start:end]
+            
+            # The anchor is only a cheap literal hint; the full check runs on the parsed message
+            if self.non_plain_ascii_pattern.search(raw_line) is None and not self._is_exception_bytes(raw_line):
+                pos = end + 1
+                continue
+            
+            line = self.parse_log_line(self._decode(raw_line))
+            if line and self.is_exception_line(line['message']):
+                pos = yield from self._scan_stack_trace(data, start, end, line)
+            else:
+                pos = end + 1
+    
+    def _anchor_offsets(self, data: mmap.mmap) -> Iterator[int]:
+        """Offsets of EXCEPTION_ANCHORS hits in ascending order, found by Hyperscan when available"""
+        if EXCEPTION_ANCHOR_DATABASE is None:
+            # Without hyperscan, one C-level find() stream per literal merged in order; a few times
+            # faster than a regex alternation, which re tries branch by branch at every position
+            return heapq.merge(*(_literal_offsets(data, anchor) for anchor in EXCEPTION_ANCHORS))
+        
+        return self._hyperscan_anchor_offsets(data)
+    
+    def _hyperscan_anchor_offsets(self, data: mmap.mmap) -> Iterator[int]:
+        """Hyperscan anchor hits, scanned in ANCHOR_SCAN_CHUNK_SIZE windows so the scan stays lazy like the
+        find() fallback: a max_exceptions cut-off or a stream consumer stops it early"""
+        # Windows overlap by an anchor length minus one, so anchors across a window border are found;
+        # a hit is kept by the window its last byte falls in past the overlap, so none is reported twice
+        overlap = max(len(anchor) for anchor in EXCEPTION_ANCHORS) - 1
+        # A scratch per scan keeps concurrent scans of the shared database safe
+        scratch = hyperscan.Scratch(EXCEPTION_ANCHOR_DATABASE)
+        size = len(data)
+        base = 0
+        
+        while base < size:
+            window_end = min(base + ANCHOR_SCAN_CHUNK_SIZE + overlap, size)
+            first_new = base + overlap if base else 0
+            hits = []
+            # The callback gets the end offset of each hit, relative to the window
+            EXCEPTION_ANCHOR_DATABASE.scan(
+                data[base:window_end],
+                match_event_handler=lambda anchor_id, start, end, flags, context: hits.append(base + end - 1),
+                scratch=scratch
+            )
+            hits.sort()
+            yield from (offset for offset in hits if offset >= first_new)
+            if window_end == size:
+                break
+            base += ANCHOR_SCAN_CHUNK_SIZE
+    
+    def _is_exception_bytes(self, raw_line: bytes) -> bool:
+        """Bytes version of parse_log_line + is_exception_line for plain ASCII lines"""
+        line = raw_line.strip()
+        match = self.log_line_bytes_pattern.match(line) if line[:1].isdigit() else None
+        if match:
+            if match['sb_timestamp'] is not None:
+                line = match['sb_message']
+            elif match['alt_timestamp'] is not None:
+                line = match['alt_message']
+            else:
+                line = match['simple_message']
+        return self.exception_line_bytes_pattern.match(line) is not None
+    
+    def _scan_stack_trace(self, data: mmap.mmap, start: int, end: int,
+                          line: Dict[str, str]) -> Generator[ExceptionInfo, None, int]:
+        """Collect the stack trace following an exception line; returns the offset where the trace ended"""
+        size = len(data)
+        context: Deque[str] = deque(self._preceding_lines(data, start, 5), maxlen=5)
+        # Exceptions whose stack trace is still being collected; nested "Caused by:" lines open their own
+        open_exceptions: List[Tuple[int, Dict[str, str], List[str], List[str]]] = [(start, line, list(context), [])]
+        context.append(line['raw_line'])
+        pos = end + 1
+        
+        while pos < size:
+            end = self._line_end(data, pos)
+            next_line = self.parse_log_line(self._decode(data[pos:end]))
+            if next_line:
+                if not self.is_stack_trace_line(next_line):
+                    # End of stack trace
+                    break
+                
+                message = next_line['message'].strip()
+                for _, _, _, stack_trace in open_exceptions:
+                    if len(stack_trace) < MAX_STACK_TRACE_LINES:
+                        stack_trace.append(message)
+                
+                if self.is_exception_line(next_line['message']):
+                    open_exceptions.append((pos, next_line, list(context), []))
+                
+                context.append(next_line['raw_line'])
+            pos = end + 1
+        
+        yield from self._close_exceptions(open_exceptions)
+        return pos
+    
+    def _preceding_lines(self, data: mmap.mmap, start: int, count: int) -> List[str]:
+        """Return up to count non-empty lines before the line starting at start"""
+        lines = []
+        end = start - 1
+        
+        while end >= 0 and len(lines) < count:
+            line_start = self._line_start(data, end)
+            line = self._decode(data[line_start:end]).strip()
+            if line:
+                lines.append(line)
+            end = line_start - 1
+        
+        lines.reverse()
+        return lines
+    
+    def _line_start(self, data: mmap.mmap, pos: int) -> int:
+        """Offset of the first byte of the line containing pos"""
+        # '\r' counts as a line break too, like text mode's universal newlines;
+        # the empty line this creates inside '\r\n' is skipped like any blank line
+        newline = data.rfind(b'\n', 0, pos)
+        # Bound the '\r' search by the '\n' found, otherwise files without '\r' are scanned back to the start
+        return max(newline, data.rfind(b'\r', newline + 1, pos)) + 1
+    
+    def _line_end(self, data: mmap.mmap, pos: int) -> int:
+        """Offset of the line break ending the line containing pos (or the end of the data)"""
+        line_break = self.line_break_pattern.search(data, pos)
+        return line_break.start() if line_break else len(data)
+    
+    def _decode(self, raw: bytes) -> str:
+        """Decode a single log line"""
+        return raw.decode('utf-8', errors='replace')
+    
+    def _close_exceptions(self, open_exceptions: List[Tuple[int, Dict[str, str], List[str], List[str]]]) -> Iterator[ExceptionInfo]:
+        """Build ExceptionInfo objects for exceptions whose stack trace has ended"""
+        for offset, exception_line, surrounding_context, stack_trace in open_exceptions:
+            try:
+                yield self.build_exception_info(exception_line, surrounding_context, stack_trace)
+            except Exception as e:
+                print(f"Error extracting exception at offset {offset}: {str(e)}")
+    
+    def analyze_log_file(self, file_path: str, max_exceptions: Optional[int] = None) -> List[ExceptionInfo]:
+        """Main method to analyze a log file and extract all exceptions, or only the first max_exceptions"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Log file not found: {file_path}")
+        
+        # The scan is lazy, so stopping after max_exceptions skips the rest of the file
+        return list(islice(self.iter_exceptions(file_path), max_exceptions))
+    
+    async def astream_exceptions(self, file_path: str) -> AsyncIterator[ExceptionInfo]:
+        """Async stream of the exceptions of a log file; the scan runs in a worker thread, so callers
+        can start working on the first exceptions while the rest of the file is still being scanned"""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Log file not found: {file_path}")
         
-        raw_lines = self.read_log_file(file_path)
-        parsed_lines = []
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
         
-        # Parse all lines
-        for line in raw_lines:
-            parsed = self.parse_log_line(line)
-            if parsed:
-                parsed_lines.append(parsed)
+        def scan() -> None:
+            try:
+                for exception in self.iter_exceptions(file_path):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, exception)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
         
-        # Find and extract exceptions
-        exceptions = []
-        i = 0
-        while i < len(parsed_lines):
-            line = parsed_lines[i]
-            if self.is_exception_line(line['message']):
-                try:
-                    exception_info = self.extract_exception_details(parsed_lines, i)
-                    exceptions.append(exception_info)
-                except Exception as e:
-                    print(f"Error extracting exception at line {i}: {str(e)}")
-            i += 1
+        scanner = loop.run_in_executor(None, scan)
+        try:
+            while (item := await queue.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stop the scan early if the consumer stopped iterating
+            stop.set()
+            await scanner
+    
+    def analyze_log_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[ExceptionInfo]:
+        """Analyze several log files (e.g. rotated parts) in parallel processes; exceptions are returned in file order"""
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Log file not found: {file_path}")
         
-        return exceptions
+        if len(file_paths) <= 1:
+            return [exception for file_path in file_paths for exception in self.analyze_log_file(file_path)]
+        
+        # The scan is CPU-bound pure Python, so processes rather than threads
+        with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(file_paths))) as executor:
+            return [exception for exceptions in executor.map(_analyze_one, file_paths) for exception in exceptions]
     
     def format_exception_summary(self, exception: ExceptionInfo) -> str:
         """Format exception information for display"""
+        stack_trace = "\n".join(islice(exception.stack_trace, 10))
+        context = "\n".join(exception.surrounding_context)
         summary = f"""
 Exception Summary:
 - Timestamp: {exception.timestamp}
@@ -266,26 +576,27 @@ Exception Summary:
 - Class: {exception.class_name}
 
 Stack Trace:
-{chr(10).join(exception.stack_trace[:10])}  # Show first 10 lines
+{stack_trace}  # Show first 10 lines
 
 Context:
-{chr(10).join(exception.surrounding_context)}
+{context}
 """
         return summary
     
     @tool
-    def analyze_logs(self, log_file_path: str) -> Dict[str, Any]:
+    def analyze_logs(self, log_file_path: str, max_exceptions: Optional[int] = None) -> Dict[str, Any]:
         """
         Tool to analyze Spring Boot log files and extract exception information.
         
         Args:
             log_file_path: Path to the log file to analyze
+            max_exceptions: Stop after this many exceptions (all of them when not given)
             
         Returns:
             Dictionary containing extracted exceptions and summary
         """
         try:
-            exceptions = self.analyze_log_file(log_file_path)
+            exceptions = self.analyze_log_file(log_file_path, max_exceptions)
             
             result = {
                 "success": True,
@@ -319,6 +630,18 @@ Context:
             }
 
 
+# Agent of a worker process, created on its first file
+_worker_agent: Optional[LogAnalysisAgent] = None
+
+
+def _analyze_one(file_path: str) -> List[ExceptionInfo]:
+    """Process pool entry point; module level so only the path is sent to the worker"""
+    global _worker_agent
+    if _worker_agent is None:
+        _worker_agent = LogAnalysisAgent()
+    return _worker_agent.analyze_log_file(file_path)
+
+
 # Example usage and testing
 if __name__ == "__main__":
     agent = LogAnalysisAgent()
@@ -327,5 +650,7 @@ if __name__ == "__main__":
     print("Log Analysis Agent initialized successfully!")
     print("Available methods:")
     print("- analyze_log_file(file_path): Analyze a log file and return exceptions")
+    print("- analyze_log_files(file_paths): Analyze several log files in parallel")
+    print("- astream_exceptions(file_path): Async stream of the exceptions of a log file")
     print("- analyze_logs(file_path): Tool version for LangGraph integration")
 
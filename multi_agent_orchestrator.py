@@ -6,28 +6,150 @@ the Log Analysis Agent and Code Fixing Agent to provide end-to-end exception
 analysis and code fixing capabilities.
 """
 
+import asyncio
+import hashlib
 import json
+import operator
 import os
-from typing import List, Dict, Any, Literal, TypedDict, Annotated
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Literal, Optional, Tuple, TypedDict, Annotated, Union
 from dataclasses import asdict
-from langchain_google_genai import ChatGoogleGenerativeAI
+from itertools import islice
+from string import Template
+from datetime import datetime
+import aiofiles
+import aiosqlite
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 from langchain_core.tools import tool
+from cachetools import LFUCache, cached
 #from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 #from langchain_openai import ChatOpenAI
 #from langgraph.types import Command
 #from langgraph.prebuilt import ToolNode
 
 from log_analysis_agent import LogAnalysisAgent, ExceptionInfo
-from code_fixing_agent import CodeFixingAgent, CodeFix
+from code_fixing_agent import CodeFixingAgent, CodeFix, DEFAULT_MODEL, SMALL_LOG_MODEL
+from llm_cache import DEFAULT_CACHE_PATH, LLMCache, SqliteCacheBackend
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+
+def _content_key(block: Dict[str, Any]) -> bytes:
+    """Cache key of a report block: a digest of its content, independent of its position in the report"""
+    if orjson is not None:
+        encoded = orjson.dumps(block, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        encoded = json.dumps(block, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded).digest()
+
+
+# Report templates, compiled once at import time and filled with string.Template.substitute
+_REPORT_HEADER_TEMPLATE = Template("""# Spring Boot Log Analysis Report
+
+## Summary
+- **Log File**: $log_file_path
+- **Total Exceptions Found**: $total_exceptions
+- **Code Fixes Generated**: $total_fixes
+- **Analysis Date**: $analysis_date
+
+## Exception Analysis
+
+""")
+
+_EXCEPTION_TEMPLATE = Template("""**Message**: $message
+**Timestamp**: $timestamp
+**Location**: $class_name.$method_name() at $file_path:$line_number
+
+**Stack Trace** (first 10 lines):
+```
+$stack_trace
+```
+
+""")
+
+_FIX_TEMPLATE = Template("""**Root Cause**: $root_cause
+
+**Fix Description**: $fix_description
+
+**Confidence Score**: $confidence_score
+
+**Code Suggestions**:
+""")
+
+# One code suggestion of a fix section
+_SUGGESTION_TEMPLATE = Template("""
+$number. **File**: $file
+   **Method**: $method
+   **Description**: $description
+   
+   **Fixed Code**:
+   ```java
+   $fixed_code
+   ```
+   
+   **Explanation**: $explanation
+""")
+
+
+# Rendered report blocks; the same exceptions and fixes recur across runs, so the
+# most frequently seen ones are kept
+@cached(LFUCache(maxsize=512), key=_content_key, lock=threading.Lock())
+def _render_exception_block(exc: Dict[str, Any]) -> str:
+    """Render the body of an exception section of the report (everything below its heading)"""
+    return _EXCEPTION_TEMPLATE.substitute(
+        message=exc.get('exception_message', 'No message'),
+        timestamp=exc.get('timestamp', 'Unknown'),
+        class_name=exc.get('class_name', 'Unknown'),
+        method_name=exc.get('method_name', 'Unknown'),
+        file_path=exc.get('file_path', 'Unknown'),
+        line_number=exc.get('line_number', 'Unknown'),
+        stack_trace="\n".join(islice(exc.get('stack_trace', ()), 10))
+    )
+
+
+@cached(LFUCache(maxsize=512), key=_content_key, lock=threading.Lock())
+def _render_fix_block(fix: Dict[str, Any]) -> str:
+    """Render the body of a fix section of the report (everything below its heading)"""
+    parts = [_FIX_TEMPLATE.substitute(
+        root_cause=fix.get('root_cause', 'Unknown'),
+        fix_description=fix.get('fix_description', 'No description'),
+        confidence_score=f"{fix.get('confidence_score', 0):.2f}"
+    )]
+    
+    parts.extend(
+        _SUGGESTION_TEMPLATE.substitute(
+            number=j,
+            file=suggestion.get('file', 'Unknown'),
+            method=suggestion.get('method', 'Unknown'),
+            description=suggestion.get('description', 'No description'),
+            fixed_code=suggestion.get('fixed_code', 'No code provided'),
+            explanation=suggestion.get('explanation', 'No explanation')
+        )
+        for j, suggestion in enumerate(fix.get('code_suggestions', []), 1)
+    )
+    
+    parts.append("\n**Prevention Tips**:\n")
+    parts.extend(f"- {tip}\n" for tip in fix.get('prevention_tips', []))
+    parts.append("\n---\n\n")
+    return "".join(parts)
 
 
 class AgentState(TypedDict):
     """State shared between agents in the workflow"""
-    messages: Annotated[List[Dict[str, Any]], "Messages in the conversation"]
+    # Nodes return only the keys they change; these two lists are appended to rather than replaced
+    messages: Annotated[List[Dict[str, Any]], operator.add]
     log_file_path: str
-    exceptions: List[Dict[str, Any]]
+    exceptions: List[ExceptionInfo]  # Kept as objects; converted to dictionaries only for the report and the result
+    main_exceptions: List[ExceptionInfo]  # Exceptions with a full stack trace, the ones that get fixes
     fixes: List[Dict[str, Any]]
+    fix_results: Annotated[List[Tuple[int, CodeFix]], operator.add]  # (unique exception index, fix) from parallel nodes
     current_step: str
     error_message: str
     total_exceptions: int
@@ -35,17 +157,58 @@ class AgentState(TypedDict):
     workflow_complete: bool
 
 
+class FixTask(TypedDict):
+    """Input of a single parallel code fixing node: a batch of consecutive unique exceptions"""
+    index: int  # Unique exception index of the first exception in the batch
+    exceptions: List[ExceptionInfo]
+    model: str  # Picked per run, so concurrent runs sharing the analyzer keep their own choice
+
+
+# Node the supervisor routes to for each step; code fixing fans out dynamically instead
+_NEXT_NODE = {
+    "log_analysis": "log_analysis",
+    "report_generation": "report_generation"
+}
+
+
+# Logs with at most this many unique exceptions to fix use SMALL_LOG_MODEL
+SMALL_LOG_MAX_EXCEPTIONS = 3
+
+# Default SQLite file holding workflow checkpoints
+DEFAULT_CHECKPOINT_PATH = ".langgraph_ckpt.db"
+
+# Checkpoint serializer that allows the dataclasses kept in the workflow state; the default one
+# only warns on unregistered types for now, and strict msgpack mode refuses to restore them
+CHECKPOINT_SERDE = JsonPlusSerializer(allowed_msgpack_modules=[ExceptionInfo, CodeFix])
+
+
 class SpringBootLogAnalyzer:
     """Main orchestrator class that manages the multi-agent workflow"""
     
-    def __init__(self):
+    def __init__(self, use_batch_api: bool = False, cache_path: Optional[str] = None,
+                 stream_fixes: bool = False, checkpoint_path: Optional[str] = None):
         self.log_agent = LogAnalysisAgent()
-        self.fix_agent = CodeFixingAgent()
-        #self.supervisor_llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
-        self.supervisor_llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
+        # Fixes are kept in memory; with a cache_path (e.g. DEFAULT_CACHE_PATH) they are kept on disk,
+        # so re-running over overlapping logs skips the LLM
+        cache = LLMCache(SqliteCacheBackend(cache_path)) if cache_path else None
+        self.fix_agent = CodeFixingAgent(cache=cache)
+        # Send all fix prompts as one provider Batch API job (half the cost, slower) instead of live calls
+        self.use_batch_api = use_batch_api
+        # Start fixing each exception as soon as the log scan finds it (one LLM call per exception)
+        # instead of batching the calls after the scan
+        self.stream_fixes = stream_fixes
+        # With a checkpoint_path (e.g. DEFAULT_CHECKPOINT_PATH) every step is checkpointed, so a failed
+        # run of the same log resumes after its last completed node; off by default
+        self.checkpoint_path = checkpoint_path
 
-        # Build the workflow graph
-        self.workflow = self._build_workflow()
+        # Build the workflow graph; checkpointed runs compile it again with their checkpointer
+        self.graph = self._build_workflow()
+        self.workflow = self.graph.compile()
+    
+    def warmup(self) -> None:
+        """Do the one-off setup of a run ahead of time, for callers that analyze many logs with one analyzer"""
+        # Client for the small-log model too; the default one exists already
+        self.fix_agent.llm_for(SMALL_LOG_MODEL)
     
     def _build_workflow(self) -> StateGraph:
         """Build the LangGraph workflow for multi-agent orchestration"""
@@ -56,152 +219,250 @@ class SpringBootLogAnalyzer:
         # Add nodes for each agent and supervisor
         workflow.add_node("supervisor", self._supervisor_node)
         workflow.add_node("log_analysis", self._log_analysis_node)
-        workflow.add_node("code_fixing", self._code_fixing_node)
+        workflow.add_node("code_fixing_batch", self._code_fixing_batch_node)
+        workflow.add_node("code_fixing_batch_api", self._code_fixing_batch_api_node)
+        workflow.add_node("code_fixing_collect", self._code_fixing_collect_node)
         workflow.add_node("report_generation", self._report_generation_node)
         
-        # Define the workflow edges
+        # Define the workflow edges. Code fixing fans out to one code_fixing_batch node per
+        # batch of unique exceptions (run concurrently), then joins in code_fixing_collect.
         workflow.add_edge(START, "supervisor")
         workflow.add_conditional_edges(
             "supervisor",
             self._supervisor_decision,
             {
                 "log_analysis": "log_analysis",
-                "code_fixing": "code_fixing", 
+                "code_fixing_batch": "code_fixing_batch",
+                "code_fixing_batch_api": "code_fixing_batch_api",
+                "code_fixing_collect": "code_fixing_collect",
                 "report_generation": "report_generation",
                 "end": END
             }
         )
         workflow.add_edge("log_analysis", "supervisor")
-        workflow.add_edge("code_fixing", "supervisor")
+        workflow.add_edge("code_fixing_batch", "code_fixing_collect")
+        workflow.add_edge("code_fixing_batch_api", "code_fixing_collect")
+        workflow.add_edge("code_fixing_collect", "supervisor")
         workflow.add_edge("report_generation", END)
         
-        return workflow.compile()
+        return workflow
     
-    def _supervisor_node(self, state: AgentState) -> AgentState:
+    def _supervisor_node(self, state: AgentState) -> Dict[str, Any]:
         """Supervisor node that decides which agent to call next"""
         
         # Determine the next step based on current state
         if not state.get("log_file_path"):
-            state["error_message"] = "No log file path provided"
-            state["workflow_complete"] = True
-            return state
+            return {"error_message": "No log file path provided", "workflow_complete": True}
         
         if state["current_step"] == "start":
-            state["current_step"] = "log_analysis"
-            state["messages"].append({
-                "role": "supervisor",
-                "content": f"Starting log analysis for file: {state['log_file_path']}"
-            })
+            return {
+                "current_step": "log_analysis",
+                "messages": [{
+                    "role": "supervisor",
+                    "content": f"Starting log analysis for file: {state['log_file_path']}"
+                }]
+            }
         
         elif state["current_step"] == "log_analysis_complete":
             if state["total_exceptions"] > 0:
-                state["current_step"] = "code_fixing"
-                state["messages"].append({
-                    "role": "supervisor", 
-                    "content": f"Log analysis complete. Found {state['total_exceptions']} exceptions. Starting code fixing..."
-                })
+                return {
+                    "current_step": "code_fixing",
+                    "messages": [{
+                        "role": "supervisor", 
+                        "content": f"Log analysis complete. Found {state['total_exceptions']} exceptions. Starting code fixing..."
+                    }]
+                }
             else:
-                state["current_step"] = "report_generation"
-                state["messages"].append({
-                    "role": "supervisor",
-                    "content": "No exceptions found in log file. Generating report..."
-                })
+                return {
+                    "current_step": "report_generation",
+                    "messages": [{
+                        "role": "supervisor",
+                        "content": "No exceptions found in log file. Generating report..."
+                    }]
+                }
         
         elif state["current_step"] == "code_fixing_complete":
-            state["current_step"] = "report_generation"
-            state["messages"].append({
-                "role": "supervisor",
-                "content": f"Code fixing complete. Generated {state['total_fixes']} fixes. Generating final report..."
-            })
+            return {
+                "current_step": "report_generation",
+                "messages": [{
+                    "role": "supervisor",
+                    "content": f"Code fixing complete. Generated {state['total_fixes']} fixes. Generating final report..."
+                }]
+            }
         
         elif state["current_step"] == "report_complete":
-            state["workflow_complete"] = True
-            state["messages"].append({
-                "role": "supervisor",
-                "content": "Workflow completed successfully!"
-            })
+            return {
+                "workflow_complete": True,
+                "messages": [{
+                    "role": "supervisor",
+                    "content": "Workflow completed successfully!"
+                }]
+            }
         
-        return state
+        return {}
     
-    def _supervisor_decision(self, state: AgentState) -> Literal["log_analysis", "code_fixing", "report_generation", "end"]:
+    def _supervisor_decision(self, state: AgentState) -> Union[str, List[Send]]:
         """Decision function for supervisor routing"""
         
         if state.get("workflow_complete", False) or state.get("error_message"):
             return "end"
         
+        # Routing is a deterministic state machine, no LLM involved
         current_step = state.get("current_step", "start")
         
-        if current_step == "log_analysis":
-            return "log_analysis"
-        elif current_step == "code_fixing":
-            return "code_fixing"
-        elif current_step == "report_generation":
-            return "report_generation"
-        else:
-            return "end"
+        if current_step == "code_fixing":
+            return self._fan_out_fixes(state)
+        return _NEXT_NODE.get(current_step, "end")
+    
+    def _fan_out_fixes(self, state: AgentState) -> Union[str, List[Send]]:
+        """Send every batch of unique main exceptions to its own code_fixing_batch node"""
+        try:
+            unique_exceptions, _ = self._main_exception_groups(state)
+        except Exception:
+            # Let the collect node report the failure
+            return "code_fixing_collect"
+        
+        if not unique_exceptions or state["fix_results"]:
+            # Nothing to fix, or the fixes were already streamed during log analysis
+            return "code_fixing_collect"
+        
+        # Every fix node of this run gets the same model
+        model = self._fix_model(len(unique_exceptions))
+        
+        if self.use_batch_api:
+            # A single Batch API job covers every exception
+            return [Send("code_fixing_batch_api", FixTask(index=0, exceptions=unique_exceptions, model=model))]
+        
+        # One LLM call per batch shares the system prompt and instructions between its exceptions
+        batch_size = self.fix_agent.batch_size
+        return [
+            Send("code_fixing_batch", FixTask(index=start, exceptions=unique_exceptions[start:start + batch_size], model=model))
+            for start in range(0, len(unique_exceptions), batch_size)
+        ]
     
-    def _log_analysis_node(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def _fix_model(unique_count: int) -> str:
+        """Model for a run with this many unique exceptions to fix; few do not need the larger model"""
+        return SMALL_LOG_MODEL if unique_count <= SMALL_LOG_MAX_EXCEPTIONS else DEFAULT_MODEL
+    
+    def _main_exception_groups(self, state: AgentState) -> Tuple[List[ExceptionInfo], List[int]]:
+        """Main exceptions of the state, collapsed to unique ones plus the group index of each"""
+        
+        # Repeated exceptions are analyzed once
+        return self.fix_agent.group_duplicates(state["main_exceptions"])
+    
+    async def _log_analysis_node(self, state: AgentState) -> Dict[str, Any]:
         """Node that handles log analysis using the Log Analysis Agent"""
         
         try:
-            # Analyze the log file
-            exceptions = self.log_agent.analyze_log_file(state["log_file_path"])
+            # Analyze the log file. The scan reads the file through mmap, so it runs in a
+            # worker thread to keep the event loop free for other nodes meanwhile
+            if self.stream_fixes:
+                exceptions, fix_results = await self._analyze_and_fix_streaming(state["log_file_path"])
+            else:
+                exceptions = await asyncio.to_thread(self.log_agent.analyze_log_file, state["log_file_path"])
+                fix_results = []
             
-            # Convert exceptions to dictionaries for state storage
-            exceptions_data = []
-            for exc in exceptions:
-                exc_dict = asdict(exc)
-                exceptions_data.append(exc_dict)
+            # Filter to main exceptions (avoid duplicates) once, for both code fixing and the report
+            main_exceptions = [exc for exc in exceptions if exc.is_main]
             
             # Update state
-            state["exceptions"] = exceptions_data
-            state["total_exceptions"] = len(exceptions)
-            state["current_step"] = "log_analysis_complete"
-            
-            state["messages"].append({
-                "role": "log_analyst",
-                "content": f"Successfully analyzed log file. Found {len(exceptions)} exceptions.",
-                "data": {
-                    "exceptions_count": len(exceptions),
-                    "exception_types": list(set([exc.exception_type for exc in exceptions]))
-                }
-            })
+            return {
+                "exceptions": exceptions,
+                "main_exceptions": main_exceptions,
+                "fix_results": fix_results,
+                "total_exceptions": len(exceptions),
+                "current_step": "log_analysis_complete",
+                "messages": [{
+                    "role": "log_analyst",
+                    "content": f"Successfully analyzed log file. Found {len(exceptions)} exceptions.",
+                    "data": {
+                        "exceptions_count": len(exceptions),
+                        "exception_types": list(dict.fromkeys(exc.exception_type for exc in exceptions))
+                    }
+                }]
+            }
             
         except Exception as e:
-            state["error_message"] = f"Log analysis failed: {str(e)}"
-            state["messages"].append({
-                "role": "log_analyst",
-                "content": f"Error during log analysis: {str(e)}"
-            })
-        
-        return state
+            return {
+                "error_message": f"Log analysis failed: {str(e)}",
+                "messages": [{
+                    "role": "log_analyst",
+                    "content": f"Error during log analysis: {str(e)}"
+                }]
+            }
     
-    def _code_fixing_node(self, state: AgentState) -> AgentState:
-        """Node that handles code fixing using the Code Fixing Agent"""
+    async def _analyze_and_fix_streaming(self, log_file_path: str) -> Tuple[List[ExceptionInfo], List[Tuple[int, CodeFix]]]:
+        """Scan the log and fix every unique main exception as soon as it is found, so the LLM calls
+        overlap with the rest of the scan; returns the exceptions and the fix of each unique one
+        
+        The model follows the same rule as _fan_out_fixes. Until more than SMALL_LOG_MAX_EXCEPTIONS
+        unique exceptions are found the log may still be a small one, so those first fixes are
+        held back until either another unique exception or the end of the scan decides the model.
+        """
+        semaphore = asyncio.Semaphore(self.fix_agent.max_workers)
+        
+        async def fix(exception: ExceptionInfo, model: str) -> CodeFix:
+            async with semaphore:
+                return await self.fix_agent.aanalyze_exception(exception, model=model)
         
+        exceptions = []
+        # Insertion order matches the unique exception order of fix_agent.group_duplicates
+        tasks: Dict[Tuple[str, str, Tuple[str, ...]], asyncio.Task] = {}
+        # Unique exceptions found while the model is undecided, in order
+        held: Dict[Tuple[str, str, Tuple[str, ...]], ExceptionInfo] = {}
+        model: Optional[str] = None
         try:
-            # Convert exception dictionaries back to ExceptionInfo objects
-            exceptions = []
-            for exc_data in state["exceptions"]:
-                exception = ExceptionInfo(
-                    timestamp=exc_data.get("timestamp", ""),
-                    log_level=exc_data.get("log_level", ""),
-                    exception_type=exc_data.get("exception_type", ""),
-                    exception_message=exc_data.get("exception_message", ""),
-                    stack_trace=exc_data.get("stack_trace", []),
-                    surrounding_context=exc_data.get("surrounding_context", []),
-                    file_path=exc_data.get("file_path", ""),
-                    line_number=exc_data.get("line_number"),
-                    method_name=exc_data.get("method_name"),
-                    class_name=exc_data.get("class_name")
-                )
+            async for exception in self.log_agent.astream_exceptions(log_file_path):
                 exceptions.append(exception)
+                if exception.is_main:
+                    signature = self.fix_agent.duplicate_signature(exception)
+                    if signature in tasks or signature in held:
+                        continue
+                    if model is not None:
+                        tasks[signature] = asyncio.create_task(fix(exception, model))
+                        continue
+                    held[signature] = exception
+                    if len(held) > SMALL_LOG_MAX_EXCEPTIONS:
+                        # Too many for a small log; start the held back fixes
+                        model = self._fix_model(len(held))
+                        for held_signature, held_exception in held.items():
+                            tasks[held_signature] = asyncio.create_task(fix(held_exception, model))
+                        held.clear()
             
-            # Filter to main exceptions (avoid duplicates)
-            main_exceptions = [exc for exc in exceptions if exc.stack_trace and len(exc.stack_trace) > 5]
+            if model is None:
+                # A small log: the scan ended before the model was decided
+                model = self._fix_model(len(held))
+                for held_signature, held_exception in held.items():
+                    tasks[held_signature] = asyncio.create_task(fix(held_exception, model))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        
+        fixes = await asyncio.gather(*tasks.values())
+        return exceptions, list(enumerate(fixes))
+    
+    async def _code_fixing_batch_node(self, task: FixTask) -> Dict[str, Any]:
+        """Node that generates the fixes for a batch of exceptions in one LLM call; runs concurrently with its siblings"""
+        # aanalyze_batch turns LLM and parsing failures into zero-confidence fixes, so this never raises
+        fixes = await self.fix_agent.aanalyze_batch(task["exceptions"], model=task["model"])
+        return {"fix_results": [(task["index"] + i, fix) for i, fix in enumerate(fixes)]}
+    
+    async def _code_fixing_batch_api_node(self, task: FixTask) -> Dict[str, Any]:
+        """Node that generates all fixes through one provider Batch API job"""
+        fixes = await self.fix_agent.aanalyze_with_batch_api(task["exceptions"], model=task["model"])
+        return {"fix_results": [(task["index"] + i, fix) for i, fix in enumerate(fixes)]}
+    
+    def _code_fixing_collect_node(self, state: AgentState) -> Dict[str, Any]:
+        """Node that joins the parallel code fixing results"""
+        
+        try:
+            _, group_indices = self._main_exception_groups(state)
             
-            # Generate fixes for main exceptions
-            fixes = self.fix_agent.analyze_multiple_exceptions(main_exceptions)
+            # Parallel nodes finish in any order; restore the exception order
+            unique_fixes = [fix for _, fix in sorted(state["fix_results"], key=lambda result: result[0])]
+            fixes = self.fix_agent.expand_duplicates(unique_fixes, group_indices)
             
             # Convert fixes to dictionaries for state storage
             fixes_data = []
@@ -210,29 +471,30 @@ class SpringBootLogAnalyzer:
                 fixes_data.append(fix_dict)
             
             # Update state
-            state["fixes"] = fixes_data
-            state["total_fixes"] = len(fixes)
-            state["current_step"] = "code_fixing_complete"
-            
-            state["messages"].append({
-                "role": "code_fixer",
-                "content": f"Successfully generated {len(fixes)} code fixes.",
-                "data": {
-                    "fixes_count": len(fixes),
-                    "avg_confidence": sum([fix.confidence_score for fix in fixes]) / len(fixes) if fixes else 0
-                }
-            })
+            return {
+                "fixes": fixes_data,
+                "total_fixes": len(fixes),
+                "current_step": "code_fixing_complete",
+                "messages": [{
+                    "role": "code_fixer",
+                    "content": f"Successfully generated {len(fixes)} code fixes.",
+                    "data": {
+                        "fixes_count": len(fixes),
+                        "avg_confidence": sum(fix.confidence_score for fix in fixes) / len(fixes) if fixes else 0
+                    }
+                }]
+            }
             
         except Exception as e:
-            state["error_message"] = f"Code fixing failed: {str(e)}"
-            state["messages"].append({
-                "role": "code_fixer",
-                "content": f"Error during code fixing: {str(e)}"
-            })
-        
-        return state
+            return {
+                "error_message": f"Code fixing failed: {str(e)}",
+                "messages": [{
+                    "role": "code_fixer",
+                    "content": f"Error during code fixing: {str(e)}"
+                }]
+            }
     
-    def _report_generation_node(self, state: AgentState) -> AgentState:
+    async def _report_generation_node(self, state: AgentState) -> Dict[str, Any]:
         """Node that generates the final analysis report"""
         
         try:
@@ -241,111 +503,104 @@ class SpringBootLogAnalyzer:
             
             # Save report to file
             report_path = f"analysis_report_{os.path.basename(state['log_file_path'])}.md"
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(report)
+            # The report is already one string; encode it once and write it in a single call
+            async with aiofiles.open(report_path, 'wb') as f:
+                await f.write(report.encode('utf-8'))
             
-            state["current_step"] = "report_complete"
-            state["messages"].append({
-                "role": "reporter",
-                "content": f"Generated comprehensive analysis report: {report_path}",
-                "data": {
-                    "report_path": report_path,
-                    "total_exceptions": state["total_exceptions"],
-                    "total_fixes": state["total_fixes"]
-                }
-            })
+            return {
+                "current_step": "report_complete",
+                "messages": [{
+                    "role": "reporter",
+                    "content": f"Generated comprehensive analysis report: {report_path}",
+                    "data": {
+                        "report_path": report_path,
+                        "total_exceptions": state["total_exceptions"],
+                        "total_fixes": state["total_fixes"]
+                    }
+                }]
+            }
             
         except Exception as e:
-            state["error_message"] = f"Report generation failed: {str(e)}"
-            state["messages"].append({
-                "role": "reporter",
-                "content": f"Error during report generation: {str(e)}"
-            })
-        
-        return state
+            return {
+                "error_message": f"Report generation failed: {str(e)}",
+                "messages": [{
+                    "role": "reporter",
+                    "content": f"Error during report generation: {str(e)}"
+                }]
+            }
     
     def _generate_comprehensive_report(self, state: AgentState) -> str:
         """Generate a comprehensive analysis report"""
         
-        report = f"""# Spring Boot Log Analysis Report
-
-## Summary
-- **Log File**: {state['log_file_path']}
-- **Total Exceptions Found**: {state['total_exceptions']}
-- **Code Fixes Generated**: {state['total_fixes']}
-- **Analysis Date**: {os.popen('date').read().strip()}
-
-## Exception Analysis
-
-"""
+        parts: List[str] = [_REPORT_HEADER_TEMPLATE.substitute(
+            log_file_path=state['log_file_path'],
+            total_exceptions=state['total_exceptions'],
+            total_fixes=state['total_fixes'],
+            analysis_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )]
         
         if state["exceptions"]:
-            for i, exc in enumerate(state["exceptions"], 1):
-                if exc.get("stack_trace") and len(exc.get("stack_trace", [])) > 5:  # Main exceptions only
-                    report += f"""### Exception {i}: {exc.get('exception_type', 'Unknown')}
-
-**Message**: {exc.get('exception_message', 'No message')}
-**Timestamp**: {exc.get('timestamp', 'Unknown')}
-**Location**: {exc.get('class_name', 'Unknown')}.{exc.get('method_name', 'Unknown')}() at {exc.get('file_path', 'Unknown')}:{exc.get('line_number', 'Unknown')}
-
-**Stack Trace** (first 10 lines):
-```
-{chr(10).join(exc.get('stack_trace', [])[:10])}
-```
-
-"""
+            for i, exc in enumerate(state["main_exceptions"], 1):
+                parts.append(f"### Exception {i}: {exc.exception_type}\n\n")
+                parts.append(_render_exception_block(asdict(exc)))
         else:
-            report += "No exceptions found in the log file.\n\n"
+            parts.append("No exceptions found in the log file.\n\n")
         
-        report += "## Code Fix Recommendations\n\n"
+        parts.append("## Code Fix Recommendations\n\n")
         
         if state["fixes"]:
             for i, fix in enumerate(state["fixes"], 1):
-                report += f"""### Fix {i}: {fix.get('exception_type', 'Unknown')}
-
-**Root Cause**: {fix.get('root_cause', 'Unknown')}
-
-**Fix Description**: {fix.get('fix_description', 'No description')}
-
-**Confidence Score**: {fix.get('confidence_score', 0):.2f}
-
-**Code Suggestions**:
-"""
-                
-                for j, suggestion in enumerate(fix.get('code_suggestions', []), 1):
-                    report += f"""
-{j}. **File**: {suggestion.get('file', 'Unknown')}
-   **Method**: {suggestion.get('method', 'Unknown')}
-   **Description**: {suggestion.get('description', 'No description')}
-   
-   **Fixed Code**:
-   ```java
-   {suggestion.get('fixed_code', 'No code provided')}
-   ```
-   
-   **Explanation**: {suggestion.get('explanation', 'No explanation')}
-"""
-                
-                report += f"""
-**Prevention Tips**:
-"""
-                for tip in fix.get('prevention_tips', []):
-                    report += f"- {tip}\n"
-                
-                report += "\n---\n\n"
+                parts.append(f"### Fix {i}: {fix.get('exception_type', 'Unknown')}\n\n")
+                parts.append(_render_fix_block(fix))
         else:
-            report += "No code fixes were generated.\n\n"
+            parts.append("No code fixes were generated.\n\n")
         
-        report += """## Workflow Messages
-
-"""
-        for msg in state["messages"]:
-            report += f"**{msg['role'].title()}**: {msg['content']}\n\n"
+        parts.append("## Workflow Messages\n\n")
+        parts.extend(f"**{msg['role'].title()}**: {msg['content']}\n\n" for msg in state["messages"])
         
-        return report
+        # Join once instead of growing a string with += (quadratic for long reports)
+        return "".join(parts)
     
     def analyze_log_file(self, log_file_path: str) -> Dict[str, Any]:
         """Main entry point to analyze a log file using the multi-agent workflow"""
+        # Blocking wrapper around aanalyze_log_file; event-loop callers should await that directly
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aanalyze_log_file(log_file_path))
+        # Called from a running loop (Jupyter, async callers of the tool), where asyncio.run cannot
+        # nest: run the workflow on its own loop in a worker thread and block until it is done
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aanalyze_log_file(log_file_path)).result()
+    
+    async def _ainvoke_checkpointed(self, initial_state: AgentState, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the workflow with SQLite checkpoints, resuming an unfinished earlier run of the same log"""
+        thread_id = self._thread_id(initial_state["log_file_path"])
+        config = {**config, "configurable": {"thread_id": thread_id}}
+        
+        async with aiosqlite.connect(self.checkpoint_path) as conn:
+            checkpointer = AsyncSqliteSaver(conn, serde=CHECKPOINT_SERDE)
+            workflow = self.graph.compile(checkpointer=checkpointer)
+            
+            snapshot = await workflow.aget_state(config)
+            if snapshot.next:
+                # An earlier run stopped part-way; continue after its last completed node
+                return await workflow.ainvoke(None, config=config)
+            
+            if snapshot.values:
+                # A finished run; start over, otherwise the appended channels (messages, fix_results) would grow
+                await checkpointer.adelete_thread(thread_id)
+            return await workflow.ainvoke(initial_state, config=config)
+    
+    @staticmethod
+    def _thread_id(log_file_path: str) -> str:
+        """Checkpoint thread of a log file; a changed file (size or mtime) gets a new thread"""
+        stat = os.stat(log_file_path)
+        identity = f"{os.path.abspath(log_file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+    
+    async def aanalyze_log_file(self, log_file_path: str) -> Dict[str, Any]:
+        """Async entry point; the code fixing LLM calls run concurrently on the event loop"""
         
         if not os.path.exists(log_file_path):
             return {
@@ -359,7 +614,9 @@ class SpringBootLogAnalyzer:
             messages=[],
             log_file_path=log_file_path,
             exceptions=[],
+            main_exceptions=[],
             fixes=[],
+            fix_results=[],
             current_step="start",
             error_message="",
             total_exceptions=0,
@@ -369,7 +626,12 @@ class SpringBootLogAnalyzer:
         
         try:
             # Run the workflow
-            final_state = self.workflow.invoke(initial_state)
+            # max_concurrency bounds the parallel code fixing nodes like the agent's own thread pool
+            config = {"max_concurrency": self.fix_agent.max_workers}
+            if self.checkpoint_path:
+                final_state = await self._ainvoke_checkpointed(initial_state, config)
+            else:
+                final_state = await self.workflow.ainvoke(initial_state, config=config)
             
             return {
                 "success": not bool(final_state.get("error_message")),
@@ -377,7 +639,7 @@ class SpringBootLogAnalyzer:
                 "log_file_path": final_state["log_file_path"],
                 "total_exceptions": final_state["total_exceptions"],
                 "total_fixes": final_state["total_fixes"],
-                "exceptions": final_state["exceptions"],
+                "exceptions": [asdict(exc) for exc in final_state["exceptions"]],
                 "fixes": final_state["fixes"],
                 "messages": final_state["messages"],
                 "workflow_complete": final_state["workflow_complete"]
@@ -403,8 +665,47 @@ def analyze_spring_boot_logs(log_file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing analysis results and code fixes
     """
-    analyzer = SpringBootLogAnalyzer()
-    return analyzer.analyze_log_file(log_file_path)
+    return _get_analyzer().analyze_log_file(log_file_path)
+
+
+# Analyzer reused by every analyze_spring_boot_logs call; built lazily on the first one
+_ANALYZER: Optional[SpringBootLogAnalyzer] = None
+_ANALYZER_LOCK = threading.Lock()
+
+
+def _get_analyzer() -> SpringBootLogAnalyzer:
+    """Return the shared analyzer, creating it on first use"""
+    global _ANALYZER
+    if _ANALYZER is None:
+        with _ANALYZER_LOCK:
+            if _ANALYZER is None:
+                _ANALYZER = SpringBootLogAnalyzer()
+    return _ANALYZER
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point (spring-log-analyzer): analyze the given log files and print a summary of each"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="spring-log-analyzer", description=main.__doc__)
+    parser.add_argument("log_files", nargs="+", help="Spring Boot log files to analyze")
+    parser.add_argument("--cache-path", nargs="?", const=DEFAULT_CACHE_PATH,
+                        help=f"keep generated fixes in this SQLite file across runs (default file: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--checkpoint-path", nargs="?", const=DEFAULT_CHECKPOINT_PATH,
+                        help=f"checkpoint runs in this SQLite file so a failed run resumes (default file: {DEFAULT_CHECKPOINT_PATH})")
+    args = parser.parse_args(argv)
+    
+    analyzer = SpringBootLogAnalyzer(cache_path=args.cache_path, checkpoint_path=args.checkpoint_path)
+    exit_code = 0
+    for log_file_path in args.log_files:
+        result = analyzer.analyze_log_file(log_file_path)
+        if result["success"]:
+            print(f"{log_file_path}: {result['total_exceptions']} exceptions, {result['total_fixes']} fixes, "
+                  f"report analysis_report_{os.path.basename(log_file_path)}.md")
+        else:
+            print(f"{log_file_path}: failed: {result['error']}")
+            exit_code = 1
+    return exit_code
 
 
 # Example usage and testing
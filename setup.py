@@ -20,6 +20,8 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/manus-ai/spring-boot-log-analyzer",
     packages=find_packages(),
+    # The application is plain top-level modules, which find_packages() does not pick up
+    py_modules=["log_analysis_agent", "code_fixing_agent", "multi_agent_orchestrator", "llm_cache"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -36,10 +38,21 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.5.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "fast": [
+            "hyperscan>=0.7.0",
+        ],
+        "batch": [
+            "google-genai>=1.20.0",
+        ],
+        "asgi": [
+            "asgiref>=3.7.0",
+            "uvicorn>=0.29.0",
+        ],
     },
     entry_points={
         "console_scripts": [